@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Cafe, SearchQuery
+from .models import Cafe, SearchQuery, SheetsConfig
 
 
 @admin.register(Cafe)
@@ -24,12 +24,25 @@ class CafeAdmin(admin.ModelAdmin):
             'fields': ('created_at',)
         }),
     )
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The change list only renders list_display columns, so skip wide ones
+        # like notes there; change/delete pages still load the full row
+        changelist_url_name = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist_url_name:
+            queryset = queryset.only(
+                'id', 'name', 'city', 'source', 'instagram_handle', 'tiktok_handle', 'created_at'
+            )
+        return queryset
 
 
 @admin.register(SearchQuery)
 class SearchQueryAdmin(admin.ModelAdmin):
     list_display = ('query_text', 'platform', 'status', 'created_by', 'created_at')
     list_filter = ('platform', 'status', 'created_at')
+    list_select_related = ('created_by',)
+    list_per_page = 50
     search_fields = ('query_text',)
     date_hierarchy = 'created_at'
     readonly_fields = ('created_at',)
@@ -42,8 +55,21 @@ class SearchQueryAdmin(admin.ModelAdmin):
             'fields': ('created_by', 'created_at')
         }),
     )
+    
+    def get_queryset(self, request):
+        # Join the creator in the same query (avoids one user lookup per row)
+        queryset = super().get_queryset(request).select_related('created_by')
+        # Only the change list is limited to its columns; change/delete/history
+        # pages still load the full row instead of deferred fields one by one
+        changelist_url_name = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist_url_name:
+            queryset = queryset.only(
+                'id', 'query_text', 'platform', 'status', 'created_at', 'created_by__username'
+            )
+        return queryset
 
 
-
-
-
+@admin.register(SheetsConfig)
+class SheetsConfigAdmin(admin.ModelAdmin):
+    list_display = ('default_spreadsheet_id', 'updated_at')
+    readonly_fields = ('updated_at',)
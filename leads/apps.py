@@ -5,6 +5,9 @@ class LeadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'leads'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
 
 
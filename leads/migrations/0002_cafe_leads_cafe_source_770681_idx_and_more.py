@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['source', 'city'], name='leads_cafe_source_770681_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquery',
+            index=models.Index(fields=['-created_at', 'platform'], name='leads_searc_created_ba2ae2_idx'),
+        ),
+    ]
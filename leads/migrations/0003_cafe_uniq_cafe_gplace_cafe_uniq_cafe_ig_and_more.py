@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0002_cafe_leads_cafe_source_770681_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='cafe',
+            constraint=models.UniqueConstraint(condition=models.Q(('source', 'google_maps'), ('google_place_id__isnull', False), models.Q(('google_place_id', ''), _negated=True)), fields=('source', 'google_place_id'), name='uniq_cafe_gplace'),
+        ),
+        migrations.AddConstraint(
+            model_name='cafe',
+            constraint=models.UniqueConstraint(condition=models.Q(('source', 'apify_instagram'), ('instagram_handle__isnull', False), models.Q(('instagram_handle', ''), _negated=True)), fields=('source', 'instagram_handle'), name='uniq_cafe_ig'),
+        ),
+        migrations.AddConstraint(
+            model_name='cafe',
+            constraint=models.UniqueConstraint(condition=models.Q(('source', 'apify_tiktok'), ('tiktok_handle__isnull', False), models.Q(('tiktok_handle', ''), _negated=True)), fields=('source', 'tiktok_handle'), name='uniq_cafe_tt'),
+        ),
+    ]
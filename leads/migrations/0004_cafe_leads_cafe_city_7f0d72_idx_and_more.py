@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0003_cafe_uniq_cafe_gplace_cafe_uniq_cafe_ig_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['city'], name='leads_cafe_city_7f0d72_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['-created_at'], name='leads_cafe_created_bbd9c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['instagram_handle'], name='leads_cafe_instagr_cf31d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cafe',
+            index=models.Index(fields=['tiktok_handle'], name='leads_cafe_tiktok__5de434_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquery',
+            index=models.Index(fields=['created_by', '-created_at'], name='leads_searc_created_78171d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchquery',
+            index=models.Index(fields=['platform', 'status'], name='leads_searc_platfor_5c909e_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0004_cafe_leads_cafe_city_7f0d72_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetsConfig',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('default_spreadsheet_id', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sheets Configuration',
+                'verbose_name_plural': 'Sheets Configuration',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0005_sheetsconfig'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchquery',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='searchquery',
+            name='results_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='searchquery',
+            name='saved_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-15 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0006_searchquery_error_message_searchquery_results_json_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchquery',
+            name='export_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='searchquery',
+            name='export_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], max_length=20),
+        ),
+    ]
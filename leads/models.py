@@ -1,6 +1,15 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Q
 from django.contrib.auth.models import User
 
+from .services.cache import bump_version
+
+
+# Cache namespace of data derived from the Cafe table (list pages, counts,
+# dashboard stats); bumped whenever cafés are written
+CAFE_CACHE_NAMESPACE = 'cafes'
+
 
 class Cafe(models.Model):
     """
@@ -28,10 +37,106 @@ class Cafe(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Café'
         verbose_name_plural = 'Cafés'
+        indexes = [
+            models.Index(fields=['source', 'city']),  # also serves source-only filters
+            models.Index(fields=['city']),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['instagram_handle']),
+            models.Index(fields=['tiktok_handle']),
+        ]
+        constraints = [
+            # Same lead imported twice, keyed on the id that identifies a lead
+            # from each importer (empty/NULL ids are not leads). Only that
+            # source is constrained: branches of a chain found on Google Maps
+            # share one Instagram handle, several TikTok accounts can link the
+            # same Instagram account, and manual entries are never deduplicated.
+            models.UniqueConstraint(
+                fields=['source', 'google_place_id'],
+                name='uniq_cafe_gplace',
+                condition=Q(source='google_maps') & Q(google_place_id__isnull=False) & ~Q(google_place_id=''),
+            ),
+            models.UniqueConstraint(
+                fields=['source', 'instagram_handle'],
+                name='uniq_cafe_ig',
+                condition=Q(source='apify_instagram') & Q(instagram_handle__isnull=False) & ~Q(instagram_handle=''),
+            ),
+            models.UniqueConstraint(
+                fields=['source', 'tiktok_handle'],
+                name='uniq_cafe_tt',
+                condition=Q(source='apify_tiktok') & Q(tiktok_handle__isnull=False) & ~Q(tiktok_handle=''),
+            ),
+        ]
+
+    # Field holding the lead id each Meta.constraints entry keys on, per source
+    UNIQUE_KEY_FIELDS = {
+        'google_maps': 'google_place_id',
+        'apify_instagram': 'instagram_handle',
+        'apify_tiktok': 'tiktok_handle',
+    }
 
     def __str__(self):
         return f"{self.name} ({self.get_source_display()})"
 
+    @classmethod
+    def bulk_upsert(cls, rows, batch_size=None):
+        """
+        Inserts cafés from a list of field dictionaries in batched multi-row INSERTs.
+        
+        Rows that would duplicate an existing lead (see Meta.constraints) are
+        skipped by the database instead of raising. batch_size defaults to the
+        CAFE_BULK_CREATE_BATCH_SIZE setting. bulk_create() sends no signals, so
+        cached café listings are invalidated here.
+        
+        Returns:
+            List of the Cafe instances that were actually inserted; rows skipped
+            as duplicates (including ones another request inserted first) are
+            left out. Primary keys are populated for constrained sources only.
+        """
+        if batch_size is None:
+            batch_size = getattr(settings, 'CAFE_BULK_CREATE_BATCH_SIZE', 500)
+        cafes = [cls(**row) for row in rows]
+        cls.objects.bulk_create(cafes, ignore_conflicts=True, batch_size=batch_size)
+        inserted = cls._inserted(cafes)
+        if inserted:
+            transaction.on_commit(lambda: bump_version(CAFE_CACHE_NAMESPACE))
+        return inserted
+
+    @classmethod
+    def _inserted(cls, cafes):
+        """
+        Filters cafés passed to bulk_create(ignore_conflicts=True) down to the
+        ones that were inserted.
+        
+        bulk_create() returns ignored objects too, so the unique keys are looked
+        up again (one query per constrained source). A row is ours when its
+        created_at, set on each instance by bulk_create(), matches.
+        """
+        keyed = {}
+        skipped = set()  # id() of the instances that were not inserted
+        for cafe in cafes:
+            field = cls.UNIQUE_KEY_FIELDS.get(cafe.source)
+            key = getattr(cafe, field) if field else None
+            if key:  # Rows without a lead id are not constrained, never skipped
+                keyed.setdefault(cafe.source, []).append((key, cafe))
+        
+        for source, pairs in keyed.items():
+            field = cls.UNIQUE_KEY_FIELDS[source]
+            stored = {
+                key: (pk, created_at)
+                for key, pk, created_at in cls.objects.filter(
+                    source=source, **{f'{field}__in': [key for key, _ in pairs]}
+                ).values_list(field, 'pk', 'created_at')
+            }
+            for key, cafe in pairs:
+                pk, created_at = stored.get(key, (None, None))
+                if created_at == cafe.created_at:
+                    cafe.pk = pk
+                    del stored[key]  # A key repeated within the rows is inserted once
+                else:
+                    skipped.add(id(cafe))
+        
+        return [cafe for cafe in cafes if id(cafe) not in skipped]
+
 
 class SearchQuery(models.Model):
     """
@@ -55,16 +160,43 @@ class SearchQuery(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='done')
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Outcome of a background search (see leads.tasks)
+    results_json = models.JSONField(blank=True, null=True)
+    saved_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    # Google Sheets export of the auto-saved cafés (blank when there was none)
+    export_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True)
+    export_error = models.TextField(blank=True)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Search Query'
         verbose_name_plural = 'Search Queries'
+        indexes = [
+            models.Index(fields=['-created_at', 'platform']),
+            models.Index(fields=['created_by', '-created_at']),
+            models.Index(fields=['platform', 'status']),
+        ]
 
     def __str__(self):
         return f"{self.query_text} on {self.get_platform_display()} - {self.status}"
 
 
+class SheetsConfig(models.Model):
+    """
+    Single-row store for Google Sheets settings that are created at runtime.
+    """
+    default_spreadsheet_id = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Sheets Configuration'
+        verbose_name_plural = 'Sheets Configuration'
+
+    def __str__(self):
+        return self.default_spreadsheet_id or 'No default spreadsheet'
+
+
 
 
 
@@ -13,11 +13,55 @@ Requires the following environment variables:
 - APIFY_ACTOR_INSTAGRAM: Actor ID for Instagram search
 """
 
+import orjson
 import requests
 import time
 import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+# Shared session so repeated calls to api.apify.com (notably run-status polling)
+# reuse pooled HTTPS connections instead of paying a new TLS handshake each time.
+# urllib3 only retries idempotent methods by default, so starting a run (POST)
+# is never retried and cannot launch duplicate actor runs.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# Run-status long-polls (waitForFinish) use their own session without read
+# retries: urllib3 would otherwise re-send a poll that timed out, holding one
+# call for several wait periods and past the deadline enforced by
+# _wait_for_run_completion(), which re-polls itself instead.
+_POLL_SESSION = requests.Session()
+_POLL_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, read=False, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+# Patterns used to pull an Instagram handle out of TikTok bios, compiled once
+# and tried in priority order by _extract_instagram_handle(): an instagram.com
+# URL wins over an "IG:/Insta:/Instagram: name" prefix, which wins over a
+# camera/letter emoji followed by a name. The prefix patterns never read the
+# instagram.com domain itself as a prefix or a name.
+_IG_PREFIX = r'(?:instagram|insta|ig)(?![a-z]*\.com)'
+_NOT_IG_DOMAIN = r'(?!(?:www\.)?instagram\.com)'
+_IG_URL_RE = re.compile(r'instagram\.com/([a-zA-Z0-9._]+)', re.IGNORECASE)
+_IG_PREFIX_RE = re.compile(_IG_PREFIX + r'[\s:]*@?' + _NOT_IG_DOMAIN + r'([a-zA-Z0-9._]+)', re.IGNORECASE)
+_IG_MENTION_RE = re.compile(_IG_PREFIX + r'[\s:]*[@]' + _NOT_IG_DOMAIN + r'([a-zA-Z0-9._]+)', re.IGNORECASE)
+_IG_EMOJI_RE = re.compile(r'(?:📷|📸|💌)[\s]*@?' + _NOT_IG_DOMAIN + r'([a-zA-Z0-9._]{3,30})')
+
+# Shared read-only default for missing nested objects in actor output (never mutated)
+_EMPTY_DICT = {}
+
+# Words that follow "IG"/"Instagram" in bios but are not usernames
+_STOPWORDS = frozenset({'follow', 'me', 'on', 'for', 'more'})
 
 
 def run_apify_actor(query: str, platform: str, search_type: str = 'profile') -> List[Dict]:
@@ -62,13 +106,11 @@ def run_apify_actor(query: str, platform: str, search_type: str = 'profile') ->
     # Start the actor run
     run_id = _start_actor_run(actor_id, query, api_token, search_type, platform)
     
-    # Wait for the run to complete
+    # Wait for the run to complete; items are streamed from the dataset
     results = _wait_for_run_completion(run_id, api_token)
     
-    # Normalize the results based on platform
-    normalized = _normalize_results(results, platform.lower())
-    
-    return normalized
+    # Normalize the results based on platform as they arrive
+    return list(_normalize_results(results, platform.lower()))
 
 
 def _start_actor_run(actor_id: str, query: str, api_token: str, search_type: str = 'profile', platform: str = 'instagram') -> str:
@@ -157,9 +199,9 @@ def _start_actor_run(actor_id: str, query: str, api_token: str, search_type: str
             }
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = _SESSION.post(url, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         run_id = data.get('data', {}).get('id')
         if not run_id:
@@ -179,9 +221,14 @@ def _start_actor_run(actor_id: str, query: str, api_token: str, search_type: str
         raise Exception(error_msg)
 
 
-def _wait_for_run_completion(run_id: str, api_token: str, max_wait_seconds: int = 300) -> List[Dict]:
+def _wait_for_run_completion(run_id: str, api_token: str, max_wait_seconds: int = 300) -> Iterator[Dict]:
     """
-    Polls the Apify API until the run completes.
+    Waits for the Apify run to complete using server-side long polling.
+    
+    Each status request passes ``waitForFinish`` so Apify holds the request
+    open until the run finishes (up to 60 seconds), returning as soon as it is
+    done. If a response comes back early while the run is still going, we back
+    off exponentially before asking again.
     
     Args:
         run_id: The actor run ID
@@ -189,7 +236,7 @@ def _wait_for_run_completion(run_id: str, api_token: str, max_wait_seconds: int
         max_wait_seconds: Maximum time to wait (default: 5 minutes)
     
     Returns:
-        List of results from the actor run
+        Iterator over the results of the actor run (see _fetch_dataset_items)
     """
     url = f"https://api.apify.com/v2/actor-runs/{run_id}"
     
@@ -198,15 +245,25 @@ def _wait_for_run_completion(run_id: str, api_token: str, max_wait_seconds: int
     }
     
     start_time = time.time()
+    attempt = 0
     
     while True:
-        if time.time() - start_time > max_wait_seconds:
+        remaining = max_wait_seconds - (time.time() - start_time)
+        if remaining <= 0:
             raise Exception("Apify actor run timed out")
         
+        wait_for_finish = int(min(60, remaining))
+        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            request_started = time.time()
+            response = _POLL_SESSION.get(
+                url,
+                headers=headers,
+                params={'waitForFinish': wait_for_finish},
+                timeout=wait_for_finish + 5,
+            )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             status = data.get('data', {}).get('status')
             
@@ -216,17 +273,27 @@ def _wait_for_run_completion(run_id: str, api_token: str, max_wait_seconds: int
             
             elif status in ['FAILED', 'ABORTED', 'TIMED-OUT']:
                 raise Exception(f"Apify actor run {status.lower()}")
-            
-            # Still running, wait and retry
-            time.sleep(5)
         
+        except requests.ReadTimeout:
+            continue  # Held for the full wait and then some; poll again until the deadline
         except requests.RequestException as e:
             raise Exception(f"Failed to check Apify run status: {str(e)}")
+        
+        # Still running. A full long-poll can be re-issued immediately; an early
+        # return means the server did not hold the request, so back off instead.
+        if time.time() - request_started < wait_for_finish:
+            delay = min(30, 0.5 * 2 ** attempt)
+            attempt += 1
+            time.sleep(min(delay, max(0, max_wait_seconds - (time.time() - start_time))))
 
 
-def _fetch_dataset_items(run_id: str, api_token: str) -> List[Dict]:
+def _fetch_dataset_items(run_id: str, api_token: str) -> Iterator[Dict]:
     """
-    Fetches the dataset items from a completed actor run.
+    Streams the dataset items from a completed actor run.
+    
+    Items are requested as JSON Lines and yielded one at a time, so the full
+    dataset is never held in memory and normalization can start while the
+    rest of the response is still downloading.
     """
     url = f"https://api.apify.com/v2/actor-runs/{run_id}/dataset/items"
     
@@ -234,10 +301,17 @@ def _fetch_dataset_items(run_id: str, api_token: str) -> List[Dict]:
         'Authorization': f'Bearer {api_token}',
     }
     
+    params = {
+        'format': 'jsonl',
+        'clean': 'true',
+    }
+    
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        return response.json()
+        with _SESSION.get(url, headers=headers, params=params, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield orjson.loads(line)
     
     except requests.RequestException as e:
         raise Exception(f"Failed to fetch Apify dataset items: {str(e)}")
@@ -260,84 +334,105 @@ def _extract_instagram_handle(bio_text: str) -> Optional[str]:
         return None
     
     # Pattern 1: Direct Instagram URL
-    url_pattern = r'instagram\.com/([a-zA-Z0-9._]+)'
-    match = re.search(url_pattern, bio_text, re.IGNORECASE)
+    match = _IG_URL_RE.search(bio_text)
     if match:
         return match.group(1)
     
     # Pattern 2: IG: @username or Instagram: @username
-    ig_pattern = r'(?:ig|insta|instagram)[\s:]*@?([a-zA-Z0-9._]+)'
-    match = re.search(ig_pattern, bio_text, re.IGNORECASE)
+    match = _IG_PREFIX_RE.search(bio_text)
     if match:
         username = match.group(1)
         # Filter out common words that aren't usernames
-        if username.lower() not in ['follow', 'me', 'on', 'for', 'more']:
+        if username.lower() not in _STOPWORDS:
             return username
     
     # Pattern 3: Look for @username after words like "IG" or "Instagram"
-    mention_pattern = r'(?:ig|insta|instagram)[\s:]*[@]([a-zA-Z0-9._]+)'
-    match = re.search(mention_pattern, bio_text, re.IGNORECASE)
+    match = _IG_MENTION_RE.search(bio_text)
     if match:
         return match.group(1)
     
     # Pattern 4: Find Instagram handle in emoji context (common in bios)
-    # e.g., "📷 @username" or "IG 📸 username"
-    emoji_pattern = r'(?:📷|📸|💌)[\s]*@?([a-zA-Z0-9._]{3,30})'
-    match = re.search(emoji_pattern, bio_text)
-    if match and ('ig' in bio_text.lower() or 'insta' in bio_text.lower()):
-        return match.group(1)
+    # e.g., "📷 @username" or "IG 📸 username"; only trusted if the bio mentions Instagram
+    match = _IG_EMOJI_RE.search(bio_text)
+    if match:
+        lowered = bio_text.lower()
+        if 'ig' in lowered or 'insta' in lowered:
+            return match.group(1)
     
     return None
 
 
-def _normalize_results(results: List[Dict], platform: str) -> List[Dict]:
+def _normalize_tiktok_item(item: Dict) -> Dict:
     """
-    Normalizes results from different Apify actors into a consistent format.
-    
-    Note: Field names may vary depending on the specific Apify actor you use.
-    Adjust the field mappings below based on your actor's output schema.
+    Maps one TikTok actor item to the normalized account format.
     """
-    normalized = []
-    
-    for item in results:
-        # Common field mappings - adjust based on your specific Apify actors
-        if platform == 'tiktok':
-            bio = item.get('authorMeta', {}).get('signature', '') or item.get('signature', '')
-            
-            # Extract Instagram handle from bio
-            instagram_handle = _extract_instagram_handle(bio)
-            
-            normalized_item = {
-                'name': item.get('authorMeta', {}).get('name') or item.get('nickname', ''),
-                'username': item.get('authorMeta', {}).get('name') or item.get('author', ''),
-                'profile_url': f"https://www.tiktok.com/@{item.get('author', '')}",
-                'platform': 'tiktok',
-                'follower_count': item.get('authorMeta', {}).get('fans', 0),
-                'bio': bio,
-                'instagram_handle': instagram_handle,  # Add extracted Instagram handle
-                'instagram_url': f"https://www.instagram.com/{instagram_handle}/" if instagram_handle else None,
-            }
-        
-        elif platform == 'instagram':
-            username = item.get('username', '')
-            normalized_item = {
-                'name': item.get('full_name') or item.get('fullName', ''),
-                'username': username,
-                'profile_url': f"https://www.instagram.com/{username}/",
-                'platform': 'instagram',
-                'follower_count': item.get('followersCount') or item.get('edge_followed_by', {}).get('count', 0),
-                'bio': item.get('biography', ''),
-            }
-        
-        else:
-            continue
-        
-        # Only add if we have at least a username
-        if normalized_item.get('username'):
-            normalized.append(normalized_item)
-    
-    return normalized
+    author_meta = item.get('authorMeta') or _EMPTY_DICT
+    author_name = author_meta.get('name')
+    bio = author_meta.get('signature') or item.get('signature', '')
+    
+    # Extract Instagram handle from bio
+    instagram_handle = _extract_instagram_handle(bio)
+    
+    return {
+        'name': author_name or item.get('nickname', ''),
+        'username': author_name or item.get('author', ''),
+        'profile_url': f"https://www.tiktok.com/@{item.get('author', '')}",
+        'platform': 'tiktok',
+        'follower_count': author_meta.get('fans', 0),
+        'bio': bio,
+        'instagram_handle': instagram_handle,  # Add extracted Instagram handle
+        'instagram_url': f"https://www.instagram.com/{instagram_handle}/" if instagram_handle else None,
+    }
 
 
+def _normalize_instagram_item(item: Dict) -> Dict:
+    """
+    Maps one Instagram actor item to the normalized account format.
+    """
+    username = item.get('username', '')
+    followed_by = item.get('edge_followed_by') or _EMPTY_DICT
+    
+    return {
+        'name': item.get('full_name') or item.get('fullName', ''),
+        'username': username,
+        'profile_url': f"https://www.instagram.com/{username}/",
+        'platform': 'instagram',
+        'follower_count': item.get('followersCount') or followed_by.get('count', 0),
+        'bio': item.get('biography', ''),
+    }
 
 
+# Field mapping per platform - adjust these if you switch to an actor with a
+# different output schema
+_EXTRACTORS: Dict[str, Callable[[Dict], Dict]] = {
+    'tiktok': _normalize_tiktok_item,
+    'instagram': _normalize_instagram_item,
+}
+
+
+def _normalize_results(results: Iterable[Dict], platform: str) -> Iterator[Dict]:
+    """
+    Normalizes results from different Apify actors into a consistent format,
+    yielding each normalized item as soon as it is built.
+    
+    The platform's extractor is resolved once and then applied to every item.
+    Note: Field names may vary depending on the specific Apify actor you use;
+    see _EXTRACTORS.
+    """
+    extract = _EXTRACTORS.get(platform)
+    if extract is None:
+        return
+    
+    seen = set()  # (platform, username) pairs already added
+    
+    for normalized_item in map(extract, results):
+        # Only add if we have at least a username
+        if not normalized_item['username']:
+            continue
+        
+        # The same profile can show up several times (e.g. across hashtag pages)
+        key = (platform, normalized_item['username'].lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        yield normalized_item
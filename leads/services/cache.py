@@ -0,0 +1,104 @@
+"""
+Caching helpers for the external API integrations.
+
+Entries are stored with django.core.cache, so they are shared by every
+worker process when a Redis cache is configured (see CACHES in settings).
+"""
+
+import functools
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from typing import Callable, Optional
+
+
+_MISSING = object()
+
+
+def make_key(prefix: str, value: str) -> str:
+    """
+    Builds a short, backend-safe cache key from an arbitrary string.
+    """
+    digest = hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def is_shared_cache() -> bool:
+    """
+    Whether the default cache is shared by all worker processes.
+    
+    The per-process local-memory (and dummy) backends are not, so a
+    bump_version() in one worker is invisible to the others.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    return not backend.endswith(('.LocMemCache', '.DummyCache'))
+
+
+def get_version(namespace: str) -> int:
+    """
+    Returns the current version number of a cache namespace.
+    
+    Include it in cache keys of data derived from a table; bump_version()
+    then invalidates all of them at once without deleting anything.
+    """
+    return cache.get_or_set(f"version:{namespace}", time.time_ns, None)
+
+
+def bump_version(namespace: str):
+    """
+    Moves a cache namespace to a new version, orphaning its existing entries.
+    """
+    version_key = f"version:{namespace}"
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Evicted or never set; start from a value no old entry can have used
+        cache.set(version_key, time.time_ns(), None)
+
+
+def cached(ttl: int, key: Callable[..., Optional[str]], miss_ttl: Optional[int] = None):
+    """
+    Caches a function's return value in the Django cache.
+    
+    Args:
+        ttl: Lifetime in seconds of a cached result
+        key: Called with the function's arguments; returns the cache key, or
+            None to bypass the cache for that call
+        miss_ttl: Lifetime in seconds of a cached None result. None results
+            are not cached when this is not set.
+    
+    The wrapped function gains an ``invalidate(*args, **kwargs)`` attribute
+    that deletes the entry for the given arguments.
+    
+    Example:
+        @cached(ttl=3600, key=lambda place_id: make_key('gplace', place_id))
+        def get_place_details(place_id): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if cache_key is None:
+                return func(*args, **kwargs)
+            
+            value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
+            
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.set(cache_key, value, ttl)
+            elif miss_ttl:
+                cache.set(cache_key, None, miss_ttl)
+            return value
+        
+        def invalidate(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if cache_key is not None:
+                cache.delete(cache_key)
+        
+        wrapper.invalidate = invalidate
+        return wrapper
+    
+    return decorator
@@ -5,13 +5,68 @@ This module provides functions to search for places using the official Google Pl
 Requires GOOGLE_MAPS_API_KEY to be set in environment variables.
 """
 
+import logging
 import requests
 import re
-from bs4 import BeautifulSoup
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from typing import List, Dict, Optional
 
+from .cache import cached, make_key
 
+
+logger = logging.getLogger(__name__)
+
+# Shared session so Places API calls and website scrapes reuse pooled
+# connections instead of opening a new TCP+TLS connection per request.
+# Scrapes touch many distinct hosts, so keep enough per-host pools around
+# that maps.googleapis.com isn't evicted (and re-handshaken) mid-search.
+HTTP_POOL_SIZE = 20
+
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)  # Some café websites are still served over plain HTTP
+
+# Used when scraping café websites for Instagram links
+_INSTAGRAM_LINK_SELECTOR = (
+    'a[href*="instagram.com" i], meta[property^="og:" i], meta[property^="twitter:" i]'
+)
+# Text Search pagination: Google returns 20 results per page, 3 pages at most
+MAX_SEARCH_PAGES = 3
+NEXT_PAGE_TOKEN_DELAY = 2  # seconds before a next_page_token can be used
+
+# Cache lifetimes (seconds) for Google Places and website lookups
+SEARCH_CACHE_TIMEOUT = 60 * 60              # text search results: 1 hour
+PLACE_DETAILS_CACHE_TIMEOUT = 60 * 60 * 24  # place data is stable: 24 hours
+INSTAGRAM_CACHE_TIMEOUT = 60 * 60 * 24      # handle found on a website
+INSTAGRAM_MISS_CACHE_TIMEOUT = 60 * 30      # no handle found / fetch failed
+
+# Upper bound on how much of a café website is downloaded and parsed
+MAX_WEBSITE_BYTES = 512 * 1024
+
+# Instagram system paths that look like handles in instagram.com/<path> URLs
+_INSTAGRAM_RESERVED_PATHS = ('p', 'reel', 'tv', 'stories', 'explore', 'accounts', 'direct')
+
+# instagram.com/<handle>: reserved paths are rejected by the lookahead and
+# handles are at most 30 characters, so there is no post-filtering per match
+_INSTAGRAM_HANDLE_RE = re.compile(
+    r'instagram\.com/'
+    r'(?!(?:' + '|'.join(_INSTAGRAM_RESERVED_PATHS) + r')(?![a-zA-Z0-9._]))'
+    r'([a-zA-Z0-9._]{1,30})(?![a-zA-Z0-9._])',
+    re.IGNORECASE,
+)
+
+
+@cached(ttl=SEARCH_CACHE_TIMEOUT, key=lambda query: make_key('gplaces', query))
 def search_places(query: str) -> List[Dict]:
     """
     Calls Google Places API Text Search and returns normalized list of places.
@@ -20,7 +75,8 @@ def search_places(query: str) -> List[Dict]:
         query: Search query string (e.g., "matcha café in Tokyo")
     
     Returns:
-        List of dictionaries containing place information:
+        List of dictionaries (up to MAX_SEARCH_PAGES pages of 20, one per
+        place_id) containing place information:
         - name: Business name
         - address: Formatted address
         - website: Website URL (if available)
@@ -30,6 +86,8 @@ def search_places(query: str) -> List[Dict]:
     Raises:
         ValueError: If API key is not configured
         requests.RequestException: If API call fails
+    
+    Results are cached per query for SEARCH_CACHE_TIMEOUT seconds.
     """
     api_key = settings.GOOGLE_MAPS_API_KEY
     
@@ -45,28 +103,52 @@ def search_places(query: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get('status') != 'OK':
-            error_message = data.get('error_message', data.get('status'))
-            raise Exception(f"Google Places API error: {error_message}")
-        
         results = []
-        for place in data.get('results', []):
-            # Extract city from address components if available
-            city = _extract_city(place.get('address_components', []))
+        seen_place_ids = set()  # places already added (pages can overlap)
+        
+        for page in range(MAX_SEARCH_PAGES):
+            response = _SESSION.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
             
-            place_data = {
-                'name': place.get('name', ''),
-                'address': place.get('formatted_address', ''),
-                'place_id': place.get('place_id', ''),
-                'city': city,
-                'website': None,  # Website requires Place Details API call
-            }
+            if data.get('status') != 'OK':
+                if page > 0:
+                    break  # Keep the pages we already have
+                error_message = data.get('error_message', data.get('status'))
+                raise Exception(f"Google Places API error: {error_message}")
+            
+            for place in data.get('results', []):
+                # Skip places repeated across pages; each one costs a details
+                # request and a website scrape when enriched
+                place_id = place.get('place_id', '')
+                if place_id:
+                    if place_id in seen_place_ids:
+                        continue
+                    seen_place_ids.add(place_id)
+                
+                # Extract city from address components if available
+                city = _extract_city(place.get('address_components', []))
+                
+                place_data = {
+                    'name': place.get('name', ''),
+                    'address': place.get('formatted_address', ''),
+                    'place_id': place_id,
+                    'city': city,
+                    'website': None,  # Website requires Place Details API call
+                }
+                
+                results.append(place_data)
             
-            results.append(place_data)
+            next_page_token = data.get('next_page_token')
+            if not next_page_token:
+                break
+            
+            # Google needs a moment before a next_page_token becomes valid
+            time.sleep(NEXT_PAGE_TOKEN_DELAY)
+            params = {
+                'pagetoken': next_page_token,
+                'key': api_key,
+            }
         
         return results
     
@@ -74,6 +156,7 @@ def search_places(query: str) -> List[Dict]:
         raise Exception(f"Failed to fetch data from Google Places API: {str(e)}")
 
 
+@cached(ttl=PLACE_DETAILS_CACHE_TIMEOUT, key=lambda place_id: make_key('gplace', place_id))
 def get_place_details(place_id: str) -> Optional[Dict]:
     """
     Fetches detailed information about a specific place including website.
@@ -83,6 +166,8 @@ def get_place_details(place_id: str) -> Optional[Dict]:
     
     Returns:
         Dictionary with detailed place information including website
+    
+    Successful lookups are cached for PLACE_DETAILS_CACHE_TIMEOUT seconds.
     """
     api_key = settings.GOOGLE_MAPS_API_KEY
     
@@ -98,7 +183,7 @@ def get_place_details(place_id: str) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -130,27 +215,83 @@ def _extract_city(address_components: List[Dict]) -> Optional[str]:
     Returns:
         City name if found, None otherwise
     """
-    for component in address_components:
-        if 'locality' in component.get('types', []):
-            return component.get('long_name')
+    by_type = {
+        component_type: component.get('long_name')
+        for component in address_components
+        for component_type in component.get('types', ())
+    }
+    
+    # Prefer the city, then UK-style postal towns, then county and
+    # state/province as progressively coarser fallbacks
+    return (
+        by_type.get('locality')
+        or by_type.get('postal_town')
+        or by_type.get('administrative_area_level_2')
+        or by_type.get('administrative_area_level_1')
+    )
+
+
+def enrich_results(results: List[Dict], max_workers: int = HTTP_POOL_SIZE) -> List[Dict]:
+    """
+    Adds website and Instagram information to search_places() results.
     
-    # Fallback to administrative_area_level_1 (state/province)
-    for component in address_components:
-        if 'administrative_area_level_1' in component.get('types', []):
-            return component.get('long_name')
+    Each result runs as one pipeline (Place Details, then a scrape of the
+    returned website) on a thread pool, so a café's website is fetched as soon
+    as its own details arrive rather than after every details call finishes.
+    
+    Args:
+        results: Place dictionaries from search_places(); updated in place
+        max_workers: Maximum number of concurrent pipelines
     
-    return None
+    Returns:
+        The same list, with 'website', 'instagram_handle' and 'instagram_url'
+        filled in where found
+    """
+    pending = [result for result in results if result.get('place_id')]
+    if not pending:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        # list() re-raises any unexpected error from a worker
+        list(executor.map(_enrich_result, pending))
+    
+    return results
 
 
-def extract_instagram_from_website(website_url: str) -> Optional[str]:
+def _enrich_result(result: Dict):
+    """
+    Fetches details and the Instagram handle for a single search result.
+    """
+    details = get_place_details(result['place_id'])
+    if not details or not details.get('website'):
+        return
+    
+    result['website'] = details['website']
+    
+    instagram_handle = extract_instagram_from_website(details['website'], timeout=8)
+    if instagram_handle:
+        result['instagram_handle'] = instagram_handle
+        result['instagram_url'] = f"https://www.instagram.com/{instagram_handle}/"
+
+
+@cached(
+    ttl=INSTAGRAM_CACHE_TIMEOUT,
+    key=lambda website_url, timeout=10: make_key('website_ig', website_url) if website_url else None,
+    miss_ttl=INSTAGRAM_MISS_CACHE_TIMEOUT,
+)
+def extract_instagram_from_website(website_url: str, timeout: int = 10) -> Optional[str]:
     """
     Visits a website and extracts Instagram handle from social media links.
     
     Args:
         website_url: The website URL to scrape
+        timeout: Request timeout in seconds
     
     Returns:
         Instagram handle (without @) if found, None otherwise
+    
+    Results are cached per URL, including misses, so sites without an
+    Instagram link are not re-fetched on every search.
     """
     if not website_url:
         return None
@@ -161,58 +302,36 @@ def extract_instagram_from_website(website_url: str) -> Optional[str]:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(website_url, headers=headers, timeout=10, allow_redirects=True)
-        response.raise_for_status()
+        # Stream the page and only read the first MAX_WEBSITE_BYTES; Instagram
+        # links live in the <head> or header/footer templates, and this bounds
+        # memory and parse time on very large pages
+        with _SESSION.get(website_url, headers=headers, timeout=timeout,
+                          allow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+            body = response.raw.read(MAX_WEBSITE_BYTES, decode_content=True)
         
         # Parse HTML
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Method 1: Look for Instagram links in <a> tags
-        instagram_links = soup.find_all('a', href=re.compile(r'instagram\.com', re.IGNORECASE))
-        for link in instagram_links:
-            href = link.get('href', '')
-            handle = _extract_instagram_handle_from_url(href)
-            if handle:
-                return handle
-        
-        # Method 2: Look for Instagram in social media sections
-        # Common patterns: class="social", id="social", class="footer-social", etc.
-        social_sections = soup.find_all(['div', 'nav', 'footer', 'section'], 
-                                       class_=re.compile(r'social|footer|contact', re.IGNORECASE))
-        for section in social_sections:
-            links = section.find_all('a', href=re.compile(r'instagram\.com', re.IGNORECASE))
-            for link in links:
-                href = link.get('href', '')
-                handle = _extract_instagram_handle_from_url(href)
-                if handle:
-                    return handle
-        
-        # Method 3: Search entire page content for Instagram URLs
-        page_text = soup.get_text()
-        instagram_pattern = r'instagram\.com/([a-zA-Z0-9._]+)'
-        matches = re.findall(instagram_pattern, page_text, re.IGNORECASE)
-        if matches:
-            # Return the first valid handle
-            for match in matches:
-                if match and match not in ['p', 'reel', 'tv', 'stories', 'explore']:
-                    return match
+        tree = HTMLParser(body)
         
-        # Method 4: Check meta tags
-        meta_tags = soup.find_all('meta', property=re.compile(r'og:|twitter:', re.IGNORECASE))
-        for meta in meta_tags:
-            content = meta.get('content', '')
-            if 'instagram.com' in content.lower():
-                handle = _extract_instagram_handle_from_url(content)
+        # Method 1: Instagram links in <a> tags and og:/twitter: meta tags,
+        # collected in a single CSS pass over the document
+        for node in tree.css(_INSTAGRAM_LINK_SELECTOR):
+            url = node.attributes.get('href') or node.attributes.get('content') or ''
+            if 'instagram.com' in url.lower():
+                handle = _extract_instagram_handle_from_url(url)
                 if handle:
                     return handle
         
-        return None
+        # Method 2: Search visible page text for Instagram URLs
+        page_text = tree.body.text() if tree.body is not None else ''
+        match = _INSTAGRAM_HANDLE_RE.search(page_text)
+        return match.group(1) if match else None
     
     except requests.RequestException as e:
-        print(f"Error fetching website {website_url}: {str(e)}")
+        logger.warning("Error fetching website %s: %s", website_url, e)
         return None
     except Exception as e:
-        print(f"Error parsing website {website_url}: {str(e)}")
+        logger.warning("Error parsing website %s", website_url, exc_info=True)
         return None
 
 
@@ -234,17 +353,10 @@ def _extract_instagram_handle_from_url(url: str) -> Optional[str]:
     # - https://www.instagram.com/username/
     # - https://instagram.com/username
     # - instagram.com/username/
-    pattern = r'instagram\.com/([a-zA-Z0-9._]+)'
-    match = re.search(pattern, url, re.IGNORECASE)
-    
-    if match:
-        handle = match.group(1).rstrip('/')
-        
-        # Filter out Instagram system paths
-        if handle.lower() not in ['p', 'reel', 'tv', 'stories', 'explore', 'accounts', 'direct']:
-            return handle
+    # (Instagram system paths such as /p/ or /explore/ never match)
+    match = _INSTAGRAM_HANDLE_RE.search(url)
     
-    return None
+    return match.group(1) if match else None
 
 
 
@@ -5,22 +5,206 @@ This module provides functions to export café data to Google Sheets.
 Requires Google Sheets API credentials to be configured.
 """
 
+import gzip
+import itertools
+import logging
 import os
 import datetime
-from typing import List, Dict, Optional
+import threading
+import time
+import uuid
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Dict, Optional
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from googleapiclient.model import JsonModel
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
 
+from ..models import SheetsConfig
+
+
+logger = logging.getLogger(__name__)
 
 # Google Sheets API scopes
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Column headers for exported café rows
+HEADERS = [
+    'Name',
+    'City',
+    'Address',
+    'Website',
+    'Instagram Handle',
+    'Instagram URL',
+    'TikTok Handle',
+    'TikTok URL',
+    'Source',
+    'Date Added',
+    'Notes'
+]
+
+# Display labels for Cafe.source values; labels match what earlier exports
+# wrote so existing sheets stay consistent
+SOURCE_LABELS = {
+    'google_maps': 'Google Maps',
+    'apify_tiktok': 'Apify Tiktok',
+    'apify_instagram': 'Apify Instagram',
+    'manual': 'Manual',
+}
+
+INSTAGRAM_URL_PREFIX = 'https://www.instagram.com/'
+TIKTOK_URL_PREFIX = 'https://www.tiktok.com/@'
+
+# Primary key of the single SheetsConfig row
+SHEETS_CONFIG_PK = 1
+
+# (spreadsheet_id, tab title) -> numeric sheetId, filled by _get_sheet_id()
+_sheet_ids = {}
+
+# Background "export to new tab" jobs, run off the request thread. Job state
+# lives in this process only; finished jobs are forgotten after EXPORT_JOB_TTL.
+EXPORT_JOB_TTL = 60 * 60  # seconds
+
+_export_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sheets-export')
+_export_jobs = {}  # job id -> (submitted at, Future)
+_export_jobs_lock = threading.Lock()
+
+
+# Large exports are written in batches of at most EXPORT_CHUNK_ROWS rows; each
+# request is retried on rate limits/server errors up to SHEETS_RETRY_ATTEMPTS times
+# (appends only on rate limits, see _execute_with_rate_limit_retry)
+EXPORT_CHUNK_ROWS = 500
+SHEETS_RETRY_ATTEMPTS = 6
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Exports never shrink a tab below its frozen header row plus one row: a grid
+# can't consist of frozen rows only, and appends expect a row to follow
+MIN_SHEET_ROWS = 2
+
+# Request bodies at least this large are gzip-compressed when
+# GOOGLE_SHEETS_GZIP_REQUESTS is enabled; smaller ones aren't worth the CPU
+GZIP_MIN_BODY_BYTES = 8 * 1024
+
+# GOOGLE_SHEETS_* settings read when building API clients, bound once at
+# import and refreshed by _reload_sheets_settings()
+_GZIP_REQUESTS = False
+
+
+def _load_sheets_settings():
+    """
+    Binds the GOOGLE_SHEETS_* settings used by this module to module globals.
+    """
+    global _GZIP_REQUESTS
+    _GZIP_REQUESTS = getattr(settings, 'GOOGLE_SHEETS_GZIP_REQUESTS', False)
+
+
+_load_sheets_settings()
+
+
+@receiver(setting_changed)
+def _reload_sheets_settings(setting, **kwargs):
+    """
+    Refreshes the bound settings when a test overrides them (override_settings).
+    """
+    if setting.startswith('GOOGLE_SHEETS_'):
+        _load_sheets_settings()
+
+
+# Service-account credentials are loaded once per process and shared; the
+# API client is built once per thread because its httplib2 transport is not
+# thread-safe.
+_credentials = None
+_credentials_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _get_credentials():
+    """
+    Loads the service account credentials once and caches them for the process.
+    
+    Raises:
+        FileNotFoundError: If credentials file is not found
+    """
+    global _credentials
+    
+    if _credentials is not None:
+        return _credentials
+    
+    with _credentials_lock:
+        if _credentials is None:
+            # Path to service account credentials JSON file
+            credentials_path = getattr(settings, 'GOOGLE_SHEETS_CREDENTIALS_PATH', None)
+            
+            if not credentials_path:
+                credentials_path = os.path.join(settings.BASE_DIR, 'credentials', 'google_sheets_credentials.json')
+            
+            if not os.path.exists(credentials_path):
+                raise FileNotFoundError(
+                    f"Google Sheets credentials not found at: {credentials_path}\n"
+                    "Please follow the setup instructions in GOOGLE_SHEETS_SETUP.md"
+                )
+            
+            _credentials = service_account.Credentials.from_service_account_file(
+                credentials_path, scopes=SCOPES
+            )
+    
+    return _credentials
+
+
+class GzipHttpRequest(HttpRequest):
+    """
+    HttpRequest that sends large request bodies gzip-compressed.
+    
+    Export bodies repeat the same keys and café text on every row, so they
+    compress well; used by get_sheets_service() when GOOGLE_SHEETS_GZIP_REQUESTS
+    is enabled.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        if self.body and self.body_size >= GZIP_MIN_BODY_BYTES and not self.resumable:
+            body = self.body.encode('utf-8') if isinstance(self.body, str) else self.body
+            self.body = gzip.compress(body)
+            self.body_size = len(self.body)
+            self.headers['content-encoding'] = 'gzip'
+
+
+class OrjsonModel(JsonModel):
+    """
+    JsonModel that encodes request bodies and decodes responses with orjson,
+    which is much faster than the stdlib json module on large exports.
+    """
+    
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return orjson.dumps(body_value)
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
 
 def get_sheets_service():
     """
-    Creates and returns a Google Sheets API service instance.
+    Returns a Google Sheets API service instance.
+    
+    The instance is cached per thread, so the credentials file is read and the
+    client built only once; the bundled (static) discovery document is used so
+    no Discovery HTTP fetch is made.
     
     Returns:
         Google Sheets API service object
@@ -29,26 +213,79 @@ def get_sheets_service():
         FileNotFoundError: If credentials file is not found
         Exception: If authentication fails
     """
-    # Path to service account credentials JSON file
-    credentials_path = getattr(settings, 'GOOGLE_SHEETS_CREDENTIALS_PATH', None)
-    
-    if not credentials_path:
-        credentials_path = os.path.join(settings.BASE_DIR, 'credentials', 'google_sheets_credentials.json')
+    service = getattr(_thread_local, 'service', None)
+    if service is not None:
+        return service
     
-    if not os.path.exists(credentials_path):
-        raise FileNotFoundError(
-            f"Google Sheets credentials not found at: {credentials_path}\n"
-            "Please follow the setup instructions in GOOGLE_SHEETS_SETUP.md"
-        )
+    build_kwargs = {}
+    if _GZIP_REQUESTS:
+        build_kwargs['requestBuilder'] = GzipHttpRequest
     
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            credentials_path, scopes=SCOPES
+        service = build(
+            'sheets', 'v4',
+            credentials=_get_credentials(),
+            cache_discovery=False,
+            static_discovery=True,
+            model=OrjsonModel(),
+            **build_kwargs,
         )
-        service = build('sheets', 'v4', credentials=credentials)
-        return service
+    except FileNotFoundError:
+        raise
     except Exception as e:
         raise Exception(f"Failed to authenticate with Google Sheets: {str(e)}")
+    
+    _thread_local.service = service
+    return service
+
+
+def submit_export_to_new_tab(cafes: List[Dict], spreadsheet_id: str, search_query: str = None, source: str = None) -> str:
+    """
+    Runs export_to_new_tab() on a background thread.
+    
+    Returns:
+        Job ID to pass to get_export_status()
+    """
+    job_id = uuid.uuid4().hex
+    future = _export_executor.submit(
+        export_to_new_tab, cafes, spreadsheet_id, search_query=search_query, source=source
+    )
+    
+    with _export_jobs_lock:
+        now = time.monotonic()
+        # Forget finished jobs nobody asked about for a while
+        for old_id, (submitted_at, old_future) in list(_export_jobs.items()):
+            if old_future.done() and now - submitted_at > EXPORT_JOB_TTL:
+                del _export_jobs[old_id]
+        _export_jobs[job_id] = (now, future)
+    
+    return job_id
+
+
+def get_export_status(job_id: str) -> Optional[Dict]:
+    """
+    Returns the state of a background export job.
+    
+    Returns:
+        None if the job is unknown, otherwise a dictionary with 'status'
+        ('running', 'done' or 'failed') plus the export_to_new_tab() result
+        when done, or 'error' when failed
+    """
+    with _export_jobs_lock:
+        job = _export_jobs.get(job_id)
+    
+    if job is None:
+        return None
+    
+    future = job[1]
+    if not future.done():
+        return {'status': 'running'}
+    
+    error = future.exception()
+    if error is not None:
+        return {'status': 'failed', 'error': str(error)}
+    
+    return {'status': 'done', **future.result()}
 
 
 def create_new_sheet_tab(spreadsheet_id: str, tab_name: str) -> Dict:
@@ -81,13 +318,14 @@ def create_new_sheet_tab(spreadsheet_id: str, tab_name: str) -> Dict:
             'requests': requests
         }
         
-        response = service.spreadsheets().batchUpdate(
+        response = _execute_with_retry(service.spreadsheets().batchUpdate(
             spreadsheetId=spreadsheet_id,
             body=body
-        ).execute()
+        ))
         
         # Get the new sheet ID
         sheet_id = response['replies'][0]['addSheet']['properties']['sheetId']
+        _sheet_ids[(spreadsheet_id, tab_name)] = sheet_id
         
         return {
             'sheet_id': sheet_id,
@@ -96,8 +334,8 @@ def create_new_sheet_tab(spreadsheet_id: str, tab_name: str) -> Dict:
         }
     
     except HttpError as e:
-        # If sheet already exists, that's okay
-        if 'already exists' in str(e):
+        # If sheet already exists, that's okay (reported as a 400 INVALID_ARGUMENT)
+        if e.resp.status == 400 and 'already exists' in str(e):
             return {
                 'sheet_id': None,
                 'sheet_name': tab_name,
@@ -122,7 +360,7 @@ def export_to_new_tab(cafes: List[Dict], spreadsheet_id: str, search_query: str
         Dictionary with export results and tab information
     """
     try:
-        print(f"DEBUG export_to_new_tab: Starting export of {len(cafes)} cafés")
+        logger.debug("export_to_new_tab: starting export of %s cafés", len(cafes))
         
         # Generate tab name WITHOUT timestamp (dates are in each row)
         # Add a unique suffix to avoid conflicts
@@ -145,17 +383,19 @@ def export_to_new_tab(cafes: List[Dict], spreadsheet_id: str, search_query: str
         # Sanitize tab name (Google Sheets limits)
         tab_name = tab_name[:100]  # Max 100 chars
         
-        print(f"DEBUG export_to_new_tab: Tab name: {tab_name}")
+        logger.debug("export_to_new_tab: tab name %r", tab_name)
         
         # Create new tab
-        print(f"DEBUG export_to_new_tab: Creating new tab...")
         tab_result = create_new_sheet_tab(spreadsheet_id, tab_name)
-        print(f"DEBUG export_to_new_tab: Tab created: {tab_result}")
+        logger.debug("export_to_new_tab: tab created %s", tab_result)
         
         # Export data to the new tab
-        print(f"DEBUG export_to_new_tab: Exporting data to tab...")
-        result = export_cafes_to_sheet(cafes, spreadsheet_id, sheet_name=tab_name)
-        print(f"DEBUG export_to_new_tab: Export complete!")
+        result = export_cafes_to_sheet(
+            cafes, spreadsheet_id, sheet_name=tab_name, sheet_id=tab_result.get('sheet_id'),
+            # A tab created just now is empty; only a pre-existing one needs clearing
+            clear=tab_result.get('sheet_id') is None,
+        )
+        logger.debug("export_to_new_tab: exported %s rows to %r", result['rows_exported'], tab_name)
         
         return {
             'spreadsheet_id': spreadsheet_id,
@@ -166,8 +406,11 @@ def export_to_new_tab(cafes: List[Dict], spreadsheet_id: str, search_query: str
         }
     
     except Exception as e:
-        print(f"DEBUG export_to_new_tab: ERROR - {str(e)}")
+        logger.exception("export_to_new_tab: export to %s failed", spreadsheet_id)
         raise Exception(f"Failed to export to new tab: {str(e)}")
+
+
+def create_spreadsheet(title: str = "Café Leads") -> Dict:
     """
     Creates a new Google Spreadsheet.
     
@@ -209,13 +452,18 @@ def export_to_new_tab(cafes: List[Dict], spreadsheet_id: str, search_query: str
         raise Exception(f"Failed to create spreadsheet: {str(e)}")
 
 
-def export_cafes_to_sheet(cafes: List[Dict], spreadsheet_id: Optional[str] = None, sheet_name: str = 'Sheet1') -> Dict:
+def export_cafes_to_sheet(cafes: Iterable[Dict], spreadsheet_id: Optional[str] = None, sheet_name: str = 'Sheet1',
+                          sheet_id: Optional[int] = None, clear: bool = True) -> Dict:
     """
     Exports café data to Google Sheets.
     
     Args:
-        cafes: List of café dictionaries with data to export
+        cafes: Café dictionaries with data to export; any iterable, consumed
+            one chunk at a time (e.g. QuerySet.values().iterator())
         spreadsheet_id: Existing spreadsheet ID (creates new if None)
+        sheet_name: Title of the tab to write to
+        sheet_id: Numeric sheetId of that tab, if already known (saves a lookup)
+        clear: Clear existing cell values first; pass False for a new, empty tab
     
     Returns:
         Dictionary with spreadsheet_id and spreadsheet_url
@@ -242,72 +490,76 @@ def export_cafes_to_sheet(cafes: List[Dict], spreadsheet_id: Optional[str] = Non
             result = create_spreadsheet()
             spreadsheet_id = result['spreadsheet_id']
         
-        # Prepare header row
-        headers = [
-            'Name',
-            'City',
-            'Address',
-            'Website',
-            'Instagram Handle',
-            'Instagram URL',
-            'TikTok Handle',
-            'TikTok URL',
-            'Source',
-            'Date Added',
-            'Notes'
-        ]
-        
-        # Prepare data rows
-        rows = [headers]
-        for cafe in cafes:
-            instagram_handle = cafe.get('instagram_handle', '')
-            tiktok_handle = cafe.get('tiktok_handle', '')
-            
-            row = [
-                cafe.get('name', ''),
-                cafe.get('city', ''),
-                cafe.get('address', ''),
-                cafe.get('website', ''),
-                instagram_handle,
-                f"https://www.instagram.com/{instagram_handle}/" if instagram_handle else '',
-                tiktok_handle,
-                f"https://www.tiktok.com/@{tiktok_handle}" if tiktok_handle else '',
-                cafe.get('source', '').replace('_', ' ').title(),
-                str(cafe.get('created_at', '')),
-                cafe.get('notes', '')
-            ]
-            rows.append(row)
-        
-        # Clear existing content
-        service.spreadsheets().values().clear(
-            spreadsheetId=spreadsheet_id,
-            range=f'{sheet_name}!A:Z'
-        ).execute()
-        
-        # Write data to sheet
-        body = {
-            'values': rows
-        }
-        
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=f'{sheet_name}!A1',
-            valueInputOption='RAW',
-            body=body
-        ).execute()
-        
-        # Format header row (bold, background color)
-        format_header_row(service, spreadsheet_id)
-        
-        # Auto-resize columns
-        auto_resize_columns(service, spreadsheet_id)
+        # Header + data rows, built lazily as each chunk is sent
+        rows = itertools.chain([HEADERS], iter_cafe_rows(cafes))
+        
+        if sheet_id is None:
+            sheet_id = _get_sheet_id(service, spreadsheet_id, sheet_name)
+        
+        # Rows go out in EXPORT_CHUNK_ROWS-sized batchUpdates so a large export
+        # neither hits request size limits nor resends everything on a retry.
+        # The first batch also clears the tab (if asked) and formats the header, the last
+        # one resizes the columns; small exports are a single round trip.
+        # Each batch sets the grid to the rows written so far (at least
+        # MIN_SHEET_ROWS) and writes its chunk at an explicit start row, so a
+        # batch retried after a 5xx (which may have been applied) leaves the tab
+        # unchanged. A header-only export keeps the grid as it is.
+        chunks = _chunks(rows, EXPORT_CHUNK_ROWS)
+        chunk = next(chunks)  # always holds at least the header
+        rows_exported = -1  # don't count the header
+        start_row = 0
+        index = 1
+        
+        try:
+            while chunk is not None:
+                next_chunk = next(chunks, None)  # look ahead to spot the last chunk
+                
+                requests = []
+                if index == 1 and clear:
+                    requests.append({
+                        'updateCells': {
+                            'range': {'sheetId': sheet_id},
+                            'fields': 'userEnteredValue'
+                        }
+                    })
+                end_row = start_row + len(chunk)
+                if end_row > 1:  # the chunk has data rows, not just the header
+                    requests.append(_row_count_request(sheet_id, max(end_row, MIN_SHEET_ROWS)))
+                requests.append({
+                    'updateCells': {
+                        'start': {'sheetId': sheet_id, 'rowIndex': start_row, 'columnIndex': 0},
+                        'rows': [_row_data(row) for row in chunk],
+                        'fields': 'userEnteredValue'
+                    }
+                })
+                if index == 1:
+                    requests.append(_header_format_request(sheet_id))
+                if next_chunk is None:
+                    requests.append(_auto_resize_request(sheet_id, len(HEADERS)))
+                
+                started = time.monotonic()
+                _execute_with_retry(service.spreadsheets().batchUpdate(
+                    spreadsheetId=spreadsheet_id,
+                    body={'requests': requests}
+                ))
+                logger.debug("Exported chunk %s (%s rows) to %r in %.2fs",
+                             index, len(chunk), sheet_name, time.monotonic() - started)
+                
+                rows_exported += len(chunk)
+                start_row += len(chunk)
+                chunk = next_chunk
+                index += 1
+        except HttpError:
+            # The tab may have been deleted/recreated; look it up again next time
+            _sheet_ids.pop((spreadsheet_id, sheet_name), None)
+            raise
         
         spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
         
         return {
             'spreadsheet_id': spreadsheet_id,
             'spreadsheet_url': spreadsheet_url,
-            'rows_exported': len(cafes)
+            'rows_exported': rows_exported
         }
     
     except HttpError as e:
@@ -329,38 +581,20 @@ def append_cafes_to_sheet(cafes: List[Dict], spreadsheet_id: str, sheet_name: st
         service = get_sheets_service()
         
         # Prepare data rows (without headers)
-        rows = []
-        for cafe in cafes:
-            instagram_handle = cafe.get('instagram_handle', '')
-            tiktok_handle = cafe.get('tiktok_handle', '')
-            
-            row = [
-                cafe.get('name', ''),
-                cafe.get('city', ''),
-                cafe.get('address', ''),
-                cafe.get('website', ''),
-                instagram_handle,
-                f"https://www.instagram.com/{instagram_handle}/" if instagram_handle else '',
-                tiktok_handle,
-                f"https://www.tiktok.com/@{tiktok_handle}" if tiktok_handle else '',
-                cafe.get('source', '').replace('_', ' ').title(),
-                str(cafe.get('created_at', '')),
-                cafe.get('notes', '')
-            ]
-            rows.append(row)
-        
-        # Append data
-        body = {
-            'values': rows
-        }
-        
-        result = service.spreadsheets().values().append(
-            spreadsheetId=spreadsheet_id,
-            range=f'{sheet_name}!A:Z',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
+        rows = _build_rows(cafes)
+        
+        # Append data in EXPORT_CHUNK_ROWS-sized batches. An append that failed
+        # with a 5xx may still have been applied, so only rate limits are retried.
+        updated_range = ''
+        for chunk in _chunks(rows, EXPORT_CHUNK_ROWS):
+            result = _execute_with_rate_limit_retry(service.spreadsheets().values().append(
+                spreadsheetId=spreadsheet_id,
+                range=f'{sheet_name}!A:Z',
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body={'values': chunk}
+            ))
+            updated_range = result.get('updates', {}).get('updatedRange', '')
         
         spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
         
@@ -368,98 +602,221 @@ def append_cafes_to_sheet(cafes: List[Dict], spreadsheet_id: str, sheet_name: st
             'spreadsheet_id': spreadsheet_id,
             'spreadsheet_url': spreadsheet_url,
             'rows_added': len(cafes),
-            'updated_range': result.get('updates', {}).get('updatedRange', '')
+            'updated_range': updated_range  # range written by the last batch
         }
     
     except HttpError as e:
         raise Exception(f"Failed to append to Google Sheets: {str(e)}")
 
 
-def format_header_row(service, spreadsheet_id: str):
+def _get_sheet_id(service, spreadsheet_id: str, sheet_name: str) -> int:
     """
-    Formats the header row (bold, background color).
+    Returns the numeric sheetId of a tab, looking the spreadsheet's tabs up
+    once and caching every (spreadsheet_id, title) -> sheetId pair.
     """
-    try:
-        requests = [{
-            'repeatCell': {
-                'range': {
-                    'sheetId': 0,
-                    'startRowIndex': 0,
-                    'endRowIndex': 1
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {
-                            'red': 0.2,
-                            'green': 0.6,
-                            'blue': 0.86
-                        },
-                        'textFormat': {
-                            'bold': True,
-                            'foregroundColor': {
-                                'red': 1.0,
-                                'green': 1.0,
-                                'blue': 1.0
-                            }
-                        },
-                        'horizontalAlignment': 'CENTER'
-                    }
-                },
-                'fields': 'userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)'
-            }
-        }]
+    key = (spreadsheet_id, sheet_name)
+    
+    if key not in _sheet_ids:
+        response = _execute_with_retry(service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets(properties(sheetId,title))'
+        ))
         
-        body = {
-            'requests': requests
-        }
+        for sheet in response.get('sheets', []):
+            properties = sheet['properties']
+            _sheet_ids[(spreadsheet_id, properties['title'])] = properties['sheetId']
         
-        service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body=body
-        ).execute()
+        if key not in _sheet_ids:
+            raise Exception(f"Sheet tab '{sheet_name}' not found in spreadsheet {spreadsheet_id}")
     
-    except HttpError:
-        pass  # Non-critical, continue if formatting fails
+    return _sheet_ids[key]
 
 
-def auto_resize_columns(service, spreadsheet_id: str):
+def _chunks(items: Iterable, size: int):
     """
-    Auto-resizes all columns to fit content.
+    Yields consecutive lists of at most size items from any iterable.
     """
-    try:
-        requests = [{
-            'autoResizeDimensions': {
-                'dimensions': {
-                    'sheetId': 0,
-                    'dimension': 'COLUMNS',
-                    'startIndex': 0,
-                    'endIndex': 11
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _is_retryable_http_error(exc: BaseException) -> bool:
+    """
+    True for Sheets API errors worth retrying: rate limits and server errors.
+    """
+    return isinstance(exc, HttpError) and exc.resp.status in RETRYABLE_STATUS_CODES
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable_http_error),
+    wait=wait_random_exponential(multiplier=1, max=32),
+    stop=stop_after_attempt(SHEETS_RETRY_ATTEMPTS),
+    reraise=True,
+)
+def _execute_with_retry(request):
+    """
+    Executes a Sheets API request, retrying 429/5xx responses with jittered
+    exponential backoff.
+    """
+    return request.execute()
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    """
+    True for Sheets API rate limit (429) errors, which are never applied.
+    """
+    return isinstance(exc, HttpError) and exc.resp.status == 429
+
+
+@retry(
+    retry=retry_if_exception(_is_rate_limit_error),
+    wait=wait_random_exponential(multiplier=1, max=32),
+    stop=stop_after_attempt(SHEETS_RETRY_ATTEMPTS),
+    reraise=True,
+)
+def _execute_with_rate_limit_retry(request):
+    """
+    Executes a non-idempotent Sheets API request (e.g. values().append),
+    retrying only 429 responses with jittered exponential backoff.
+    """
+    return request.execute()
+
+
+def _build_rows(cafes: Iterable[Dict]) -> List[List]:
+    """
+    Builds sheet rows (in HEADERS order) from café dictionaries.
+    """
+    return list(iter_cafe_rows(cafes))
+
+
+def iter_cafe_rows(cafes: Iterable[Dict]) -> Iterator[List]:
+    """
+    Lazily yields the rows built by _build_rows(); also used by the CSV export.
+    """
+    ig_prefix = INSTAGRAM_URL_PREFIX
+    tt_prefix = TIKTOK_URL_PREFIX
+    source_labels = SOURCE_LABELS
+    
+    for cafe in cafes:
+        cafe_get = cafe.get
+        instagram_handle = cafe_get('instagram_handle') or ''
+        tiktok_handle = cafe_get('tiktok_handle') or ''
+        source = cafe_get('source') or ''
+        
+        # Missing and NULL values (e.g. from QuerySet.values()) become empty cells
+        yield [
+            cafe_get('name') or '',
+            cafe_get('city') or '',
+            cafe_get('address') or '',
+            cafe_get('website') or '',
+            instagram_handle,
+            f"{ig_prefix}{instagram_handle}/" if instagram_handle else '',
+            tiktok_handle,
+            f"{tt_prefix}{tiktok_handle}" if tiktok_handle else '',
+            source_labels.get(source) or source.replace('_', ' ').title(),
+            str(cafe_get('created_at') or ''),
+            cafe_get('notes') or ''
+        ]
+
+
+def _row_data(values: List) -> Dict:
+    """
+    Converts a list of values into a batchUpdate RowData of string cells.
+    """
+    return {
+        'values': [
+            {'userEnteredValue': {'stringValue': '' if value is None else str(value)}}
+            for value in values
+        ]
+    }
+
+
+def _header_format_request(sheet_id: int) -> Dict:
+    """
+    batchUpdate request that styles the first row as a header.
+    """
+    return {
+        'repeatCell': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': 0,
+                'endRowIndex': 1
+            },
+            'cell': {
+                'userEnteredFormat': {
+                    'backgroundColor': {
+                        'red': 0.2,
+                        'green': 0.6,
+                        'blue': 0.86
+                    },
+                    'textFormat': {
+                        'bold': True,
+                        'foregroundColor': {
+                            'red': 1.0,
+                            'green': 1.0,
+                            'blue': 1.0
+                        }
+                    },
+                    'horizontalAlignment': 'CENTER'
                 }
+            },
+            'fields': 'userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)'
+        }
+    }
+
+
+def _row_count_request(sheet_id: int, row_count: int) -> Dict:
+    """
+    batchUpdate request that sets the number of rows in a tab.
+    """
+    return {
+        'updateSheetProperties': {
+            'properties': {
+                'sheetId': sheet_id,
+                'gridProperties': {'rowCount': row_count}
+            },
+            'fields': 'gridProperties.rowCount'
+        }
+    }
+
+
+def _auto_resize_request(sheet_id: int, num_columns: int) -> Dict:
+    """
+    batchUpdate request that auto-resizes the first num_columns columns.
+    """
+    return {
+        'autoResizeDimensions': {
+            'dimensions': {
+                'sheetId': sheet_id,
+                'dimension': 'COLUMNS',
+                'startIndex': 0,
+                'endIndex': num_columns
             }
-        }]
-        
-        body = {
-            'requests': requests
         }
-        
-        service.spreadsheets().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body=body
-        ).execute()
-    
-    except HttpError:
-        pass  # Non-critical, continue if resizing fails
+    }
 
 
 def get_or_create_default_spreadsheet() -> str:
     """
     Gets or creates a default spreadsheet for café exports.
-    Stores spreadsheet ID in Django settings or database.
+    
+    The spreadsheet ID is stored in the SheetsConfig row, so a spreadsheet is
+    only created on the first call. The row is locked while creating so
+    concurrent workers don't each create one.
     
     Returns:
         Spreadsheet ID
     """
-    # You can store this in database or settings
-    # For now, create a new one each time
-    result = create_spreadsheet("Café Leads - " + str(__import__('datetime').datetime.now().strftime('%Y-%m-%d')))
-    return result['spreadsheet_id']
+    config = SheetsConfig.objects.filter(pk=SHEETS_CONFIG_PK).first()
+    if config and config.default_spreadsheet_id:
+        return config.default_spreadsheet_id
+    
+    with transaction.atomic():
+        config, _ = SheetsConfig.objects.select_for_update().get_or_create(pk=SHEETS_CONFIG_PK)
+        if not config.default_spreadsheet_id:
+            result = create_spreadsheet("Café Leads - " + datetime.datetime.now().strftime('%Y-%m-%d'))
+            config.default_spreadsheet_id = result['spreadsheet_id']
+            config.save(update_fields=['default_spreadsheet_id', 'updated_at'])
+    
+    return config.default_spreadsheet_id
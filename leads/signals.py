@@ -0,0 +1,34 @@
+"""
+Signal handlers for the leads app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CAFE_CACHE_NAMESPACE, Cafe
+from .services.cache import bump_version
+from .services.google_maps import extract_instagram_from_website, get_place_details
+
+
+@receiver(post_save, sender=Cafe)
+@receiver(post_delete, sender=Cafe)
+def invalidate_cafe_lookups(sender, instance, **kwargs):
+    """
+    Drops cached Google Places/website lookups for a café that was edited or
+    deleted, so the next search re-fetches them instead of serving stale data.
+    """
+    if instance.google_place_id:
+        get_place_details.invalidate(instance.google_place_id)
+    if instance.website:
+        extract_instagram_from_website.invalidate(instance.website)
+
+
+@receiver(post_save, sender=Cafe)
+@receiver(post_delete, sender=Cafe)
+def invalidate_cafe_listings(sender, **kwargs):
+    """
+    Invalidates cached café lists, counts and dashboard stats once the write
+    is committed (readers could otherwise re-cache the old rows).
+    """
+    transaction.on_commit(lambda: bump_version(CAFE_CACHE_NAMESPACE))
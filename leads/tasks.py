@@ -0,0 +1,203 @@
+"""
+Background jobs for the leads app.
+
+Long-running searches run on a small in-process thread pool so the request
+that starts them returns immediately. Progress and results are stored on the
+SearchQuery row, which the search page polls.
+"""
+
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import Cafe, SearchQuery
+from .services.apify import run_apify_actor
+from .services.google_sheets import export_to_new_tab
+
+
+logger = logging.getLogger(__name__)
+
+# Apify runs take tens of seconds to minutes; a couple at a time is plenty
+APIFY_SEARCH_WORKERS = 2
+
+_executor = ThreadPoolExecutor(max_workers=APIFY_SEARCH_WORKERS, thread_name_prefix='apify-search')
+
+# Apify runs are waited on for at most 5 minutes (see
+# apify._wait_for_run_completion) and the Sheets export retries for a few more.
+# Jobs live in the process that started them, so a search still 'running' after
+# this was lost with its worker (restart, deploy, runserver autoreload).
+SEARCH_STALE_AFTER = datetime.timedelta(minutes=15)
+
+# Cafe.source for accounts found on each Apify platform (read-only)
+_SOURCE_MAPPING = MappingProxyType({
+    'tiktok': 'apify_tiktok',
+    'instagram': 'apify_instagram',
+})
+
+
+def submit_apify_search(search_query: SearchQuery, query: str, platform: str, search_type: str):
+    """
+    Queues run_apify_search() for a SearchQuery created with status 'running'.
+    """
+    _executor.submit(run_apify_search, search_query.pk, query, platform, search_type)
+
+
+def run_apify_search(search_query_id: int, query: str, platform: str, search_type: str):
+    """
+    Runs an Apify search, auto-saves new cafés and exports them to Google Sheets.
+    
+    The results, number of saved cafés and final status ('done' or 'failed')
+    are recorded on the SearchQuery row.
+    """
+    search_query = SearchQuery.objects.get(pk=search_query_id)
+    
+    try:
+        try:
+            # Run Apify actor with search type
+            results = run_apify_actor(query, platform, search_type)
+            saved_cafes = save_apify_results(results, platform)
+        except Exception as e:
+            logger.exception("Apify search %s failed", search_query_id)
+            search_query.status = 'failed'
+            search_query.error_message = str(e)
+            search_query.save(update_fields=['status', 'error_message'])
+            return
+        
+        export = bool(saved_cafes and settings.GOOGLE_SHEETS_SPREADSHEET_ID)
+        
+        search_query.results_json = results
+        search_query.saved_count = len(saved_cafes)
+        search_query.status = 'done'
+        search_query.export_status = 'running' if export else ''
+        search_query.save(update_fields=['status', 'results_json', 'saved_count', 'export_status'])
+        
+        # Export to NEW TAB in Google Sheets; results are already visible and
+        # the page keeps polling until export_status is settled
+        if export:
+            logger.debug("Exporting %s auto-saved accounts to Google Sheets", len(saved_cafes))
+            try:
+                export_to_new_tab(
+                    saved_cafes,
+                    settings.GOOGLE_SHEETS_SPREADSHEET_ID,
+                    search_query=query,
+                    source=platform.title()
+                )
+            except Exception as e:
+                logger.warning("Google Sheets export for search %s failed", search_query_id, exc_info=True)
+                search_query.export_status = 'failed'
+                search_query.export_error = str(e)
+            else:
+                search_query.export_status = 'done'
+            search_query.save(update_fields=['export_status', 'export_error'])
+    finally:
+        # Worker threads are reused; don't leave their DB connections open
+        connections.close_all()
+
+
+def expire_stale_search(search_query: SearchQuery):
+    """
+    Marks a search (or its Sheets export) failed when it is still 'running'
+    SEARCH_STALE_AFTER after it was started, so pages stop waiting for a job
+    whose worker is gone.
+    
+    The rows are updated only while still 'running', so a job that finishes
+    at the same moment is not overwritten.
+    """
+    if timezone.now() - search_query.created_at < SEARCH_STALE_AFTER:
+        return
+    
+    pending = SearchQuery.objects.filter(pk=search_query.pk)
+    if search_query.status == 'running':
+        error_message = 'The search was interrupted before it finished. Please run it again.'
+        if pending.filter(status='running').update(status='failed', error_message=error_message):
+            search_query.status = 'failed'
+            search_query.error_message = error_message
+    if search_query.export_status == 'running':
+        export_error = 'The export was interrupted before it finished.'
+        if pending.filter(export_status='running').update(export_status='failed', export_error=export_error):
+            search_query.export_status = 'failed'
+            search_query.export_error = export_error
+
+
+def save_apify_results(results: List[Dict], platform: str) -> List[Dict]:
+    """
+    Saves Apify results that aren't already cafés.
+    
+    TikTok accounts are only saved when an Instagram handle was found in
+    their bio; Instagram accounts are always saved.
+    
+    Returns:
+        Export dictionaries (see google_sheets.export_cafes_to_sheet) for the
+        newly saved cafés
+    """
+    source = _SOURCE_MAPPING.get(platform, 'manual')
+    
+    # Handles of cafés that already exist, fetched in one IN query
+    field_name = f'{platform}_handle'
+    usernames = [r['username'] for r in results if r.get('username')]
+    existing_handles = set(
+        Cafe.objects.filter(**{f'{field_name}__in': usernames})
+        .values_list(field_name, flat=True)
+    ) if usernames else set()
+    
+    new_rows = []
+    for result in results:
+        username = result.get('username', '')
+        
+        if not username:
+            continue
+        
+        # For TikTok, only save if Instagram handle was extracted from bio
+        # For Instagram, save all results
+        if platform == 'tiktok' and not result.get('instagram_handle'):
+            continue
+        
+        # Skip cafés already saved (or repeated within these results)
+        if username in existing_handles:
+            continue
+        existing_handles.add(username)
+        
+        # New café entry, inserted below in one bulk INSERT
+        cafe_data = {
+            'name': result.get('name', username),
+            'source': source,
+        }
+        
+        # Add location if available (from place search)
+        if result.get('location'):
+            cafe_data['city'] = result.get('location', '')
+        
+        if platform == 'tiktok':
+            cafe_data['tiktok_handle'] = username
+            # If Instagram handle was extracted from TikTok bio, save it too
+            if result.get('instagram_handle'):
+                cafe_data['instagram_handle'] = result.get('instagram_handle')
+        elif platform == 'instagram':
+            cafe_data['instagram_handle'] = username
+        
+        new_rows.append(cafe_data)
+    
+    with transaction.atomic():
+        new_cafes = Cafe.bulk_upsert(new_rows)
+    
+    # Build the export list from the in-memory instances
+    return [
+        {
+            'name': cafe.name,
+            'city': cafe.city or '',
+            'address': cafe.address or '',
+            'website': cafe.website or '',
+            'instagram_handle': cafe.instagram_handle or '',
+            'tiktok_handle': cafe.tiktok_handle or '',
+            'source': cafe.source,
+            'created_at': cafe.created_at,
+            'notes': cafe.notes or ''
+        }
+        for cafe in new_cafes
+    ]
@@ -13,9 +13,14 @@ urlpatterns = [
     
     # Apify Search (TikTok/Instagram)
     path('apify-search/', views.apify_search_view, name='apify_search'),
+    path('apify-search/<int:pk>/status/', views.search_status_view, name='search_status'),
+    
+    # Background Google Sheets export status (polled by the search pages)
+    path('export-status/<str:export_id>/', views.export_status_view, name='export_status'),
     
     # Café List and Detail
     path('cafes/', views.cafe_list_view, name='cafe_list'),
+    path('cafes/export.csv', views.cafe_export_csv_view, name='cafe_export_csv'),
     path('cafes/<int:pk>/', views.CafeDetailView.as_view(), name='cafe_detail'),
     path('cafes/<int:pk>/edit/', views.CafeUpdateView.as_view(), name='cafe_update'),
 ]
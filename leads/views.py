@@ -1,19 +1,57 @@
+import csv
+import itertools
+import logging
+import uuid
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, UpdateView
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count
 from django.core.paginator import Paginator
 from django.urls import reverse_lazy
 from django.conf import settings
+from django.core.cache import cache
 
-from .models import Cafe, SearchQuery
+from .models import CAFE_CACHE_NAMESPACE, Cafe, SearchQuery
 from .forms import GoogleMapsSearchForm, ApifySearchForm, CafeUpdateForm, CafeFilterForm
-from .services.google_maps import search_places, get_place_details, extract_instagram_from_website
-from .services.apify import run_apify_actor
-from .services.google_sheets import export_cafes_to_sheet, append_cafes_to_sheet, export_to_new_tab
+from .services.google_maps import search_places, enrich_results
+from .services.cache import get_version, is_shared_cache, make_key
+from .services.google_sheets import (
+    HEADERS, append_cafes_to_sheet, export_cafes_to_sheet, submit_export_to_new_tab, get_export_status,
+    iter_cafe_rows,
+)
+from .tasks import expire_stale_search, submit_apify_search
+
+
+logger = logging.getLogger(__name__)
+
+# Columns rendered by the dashboard's "latest cafés" table and the café list
+DASHBOARD_CAFE_FIELDS = ('id', 'name', 'city', 'source', 'created_at')
+CAFE_LIST_FIELDS = (
+    'id', 'name', 'city', 'source', 'website', 'instagram_handle', 'tiktok_handle', 'created_at',
+)
+# Columns written by the Google Sheets export (see google_sheets.HEADERS)
+CAFE_EXPORT_FIELDS = (
+    'name', 'city', 'address', 'website', 'instagram_handle', 'tiktok_handle', 'source', 'created_at', 'notes',
+)
+EXPORT_DB_CHUNK_SIZE = 2000  # rows fetched per DB round trip while exporting
+CAFE_LIST_PAGE_SIZE = 20
+# Café caches are keyed on the Cafe cache version, which writes bump. With a
+# shared cache (REDIS_URL) every worker sees the bump, so entries can live long;
+# the per-process default only sees its own, so it keeps short timeouts and
+# doesn't cache list pages at all.
+CAFE_SHARED_CACHE_TIMEOUT = 60 * 5  # seconds
+CAFE_COUNT_CACHE_TIMEOUT = 60  # seconds
+DASHBOARD_CACHE_TIMEOUT = 30  # seconds
+SEARCH_RESULTS_CACHE_TIMEOUT = 60 * 10  # last search results shown on reload
+LEGACY_APIFY_SESSION_KEYS = (
+    'apify_search_results', 'apify_search_query', 'apify_search_platform', 'apify_search_type',
+)
 
 
 def auto_export_to_sheets(cafe):
@@ -52,8 +90,7 @@ def auto_export_to_sheets(cafe):
         
     except Exception as e:
         # Log error but don't break the save process
-        print(f"Auto-export to Google Sheets failed: {str(e)}")
-        pass
+        logger.warning("Auto-export to Google Sheets failed: %s", e)
 
 
 # ============================================================================
@@ -87,26 +124,34 @@ def dashboard_view(request):
     """
     Main dashboard showing statistics and recent cafés.
     """
-    # Total cafés count
-    total_cafes = Cafe.objects.count()
-    
-    # Count by source
-    source_stats = Cafe.objects.values('source').annotate(count=Count('id')).order_by('-count')
+    # Café statistics are the same for every user; cached until cafés change
+    stats_key = f'dashboard:cafes:{get_version(CAFE_CACHE_NAMESPACE)}'
+    timeout = CAFE_SHARED_CACHE_TIMEOUT if is_shared_cache() else DASHBOARD_CACHE_TIMEOUT
+    context = dict(cache.get_or_set(stats_key, _dashboard_cafe_stats, timeout))
     
-    # Latest 10 cafés
-    latest_cafes = Cafe.objects.all()[:10]
+    # Recent search queries (per user, served by the created_by/-created_at index)
+    context['recent_searches'] = SearchQuery.objects.filter(created_by=request.user).only(
+        'id', 'query_text', 'platform', 'status', 'created_at'
+    )[:5]
     
-    # Recent search queries
-    recent_searches = SearchQuery.objects.filter(created_by=request.user)[:5]
+    return render(request, 'leads/dashboard.html', context)
+
+
+def _dashboard_cafe_stats():
+    """
+    Computes the dashboard's café statistics in two queries.
+    """
+    # Count by source; the total is their sum rather than a separate COUNT
+    source_stats = list(
+        Cafe.objects.values('source').annotate(count=Count('id')).order_by('-count')
+    )
     
-    context = {
-        'total_cafes': total_cafes,
+    return {
+        'total_cafes': sum(stat['count'] for stat in source_stats),
         'source_stats': source_stats,
-        'latest_cafes': latest_cafes,
-        'recent_searches': recent_searches,
+        # Latest 10 cafés (only the columns the dashboard table shows)
+        'latest_cafes': list(Cafe.objects.only(*DASHBOARD_CAFE_FIELDS).order_by('-created_at')[:10]),
     }
-    
-    return render(request, 'leads/dashboard.html', context)
 
 
 # ============================================================================
@@ -124,67 +169,67 @@ def google_search_view(request):
     
     if request.method == 'POST':
         if 'search' in request.POST:
-            print("DEBUG: Google search initiated")
             # Handle search form submission
             form = GoogleMapsSearchForm(request.POST)
             if form.is_valid():
                 query = form.cleaned_data['query']
-                print(f"DEBUG: Search query: {query}")
+                logger.debug("Google search query: %r", query)
                 
                 try:
                     # Search using Google Maps API
-                    print("DEBUG: Calling search_places...")
                     results = search_places(query)
-                    print(f"DEBUG: Found {len(results)} results")
+                    logger.debug("Google search found %s results", len(results))
                     
-                    # Enhance results with website information and Instagram
-                    for result in results:
-                        if result.get('place_id'):
-                            details = get_place_details(result['place_id'])
-                            if details and details.get('website'):
-                                result['website'] = details['website']
-                                
-                                # Extract Instagram handle from website
-                                instagram_handle = extract_instagram_from_website(details['website'])
-                                if instagram_handle:
-                                    result['instagram_handle'] = instagram_handle
-                                    result['instagram_url'] = f"https://www.instagram.com/{instagram_handle}/"
+                    # Enhance results with website and Instagram information
+                    # (details + website scrape run concurrently per result)
+                    enrich_results(results)
                     
-                    # Store results in session for display
-                    request.session['google_search_results'] = results
+                    # Keep results for display on reload (see _store_search_results)
+                    _store_search_results(request, 'google_search_results', results)
                     request.session['google_search_query'] = query
                     
                     messages.success(request, f'Found {len(results)} results for "{query}"')
                     
-                    # AUTO-SAVE cafés with Instagram handles immediately
-                    saved_cafes = []
-                    saved_count = 0
-                    
-                    for result in results:
-                        # Only save if Instagram handle was found
-                        if not result.get('instagram_handle'):
-                            continue
-                            
-                        # Check if café already exists by place_id
-                        if result.get('place_id'):
-                            existing = Cafe.objects.filter(google_place_id=result['place_id']).first()
-                            if existing:
-                                continue
+                    # AUTO-SAVE cafés with Instagram handles immediately. Existing
+                    # leads are looked up in one query and new ones are inserted
+                    # with batched INSERTs, all in one transaction (a single commit).
+                    with transaction.atomic():
+                        candidates = [r for r in results if r.get('instagram_handle')]
                         
-                        # Create new café entry
-                        cafe = Cafe.objects.create(
-                            name=result.get('name', ''),
-                            city=result.get('city', ''),
-                            address=result.get('address', ''),
-                            website=result.get('website', ''),
-                            instagram_handle=result.get('instagram_handle', ''),
-                            source='google_maps',
-                            google_place_id=result.get('place_id', ''),
-                        )
-                        saved_count += 1
+                        # Leads are keyed by place_id (see Cafe.Meta.constraints);
+                        # branches of a chain may share an Instagram handle
+                        place_ids = [r['place_id'] for r in candidates if r.get('place_id')]
+                        seen_place_ids = set(
+                            Cafe.objects.filter(source='google_maps', google_place_id__in=place_ids)
+                            .values_list('google_place_id', flat=True)
+                        ) if place_ids else set()
+                        
+                        new_rows = []
+                        for result in candidates:
+                            place_id = result.get('place_id', '')
+                            
+                            # Skip cafés already saved (or repeated within these results)
+                            if place_id:
+                                if place_id in seen_place_ids:
+                                    continue
+                                seen_place_ids.add(place_id)
+                            
+                            new_rows.append({
+                                'name': result.get('name', ''),
+                                'city': result.get('city', ''),
+                                'address': result.get('address', ''),
+                                'website': result.get('website', ''),
+                                'instagram_handle': result['instagram_handle'],
+                                'source': 'google_maps',
+                                'google_place_id': place_id,
+                            })
                         
-                        # Add to list for bulk export
-                        saved_cafes.append({
+                        new_cafes = Cafe.bulk_upsert(new_rows)
+                    saved_count = len(new_cafes)
+                    
+                    # Build the export list from the in-memory instances
+                    saved_cafes = [
+                        {
                             'name': cafe.name,
                             'city': cafe.city or '',
                             'address': cafe.address or '',
@@ -194,31 +239,24 @@ def google_search_view(request):
                             'source': cafe.source,
                             'created_at': cafe.created_at,
                             'notes': cafe.notes or ''
-                        })
+                        }
+                        for cafe in new_cafes
+                    ]
                     
-                    # Export to NEW TAB in Google Sheets if any cafés with Instagram were found
+                    # Export to NEW TAB in Google Sheets in the background; the page
+                    # polls export_status_view for the outcome
                     if saved_cafes and settings.GOOGLE_SHEETS_SPREADSHEET_ID:
-                        try:
-                            print(f"DEBUG: Auto-saving {len(saved_cafes)} cafés with Instagram to Google Sheets")
-                            export_result = export_to_new_tab(
-                                saved_cafes,
-                                settings.GOOGLE_SHEETS_SPREADSHEET_ID,
-                                search_query=query,
-                                source='Google Maps'
-                            )
-                            messages.success(
-                                request,
-                                f'Auto-saved {saved_count} café(s) with Instagram! '
-                                f'Exported to: <strong>{export_result["tab_name"]}</strong>. '
-                                f'<a href="{export_result["spreadsheet_url"]}" target="_blank" class="alert-link">Open Sheet</a>',
-                                extra_tags='safe'
-                            )
-                        except Exception as e:
-                            print(f"DEBUG: Export failed: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                            if saved_count > 0:
-                                messages.warning(request, f'Saved {saved_count} café(s) with Instagram but export failed: {str(e)}')
+                        logger.debug("Exporting %s auto-saved cafés to Google Sheets", len(saved_cafes))
+                        request.session['sheets_export_id'] = submit_export_to_new_tab(
+                            saved_cafes,
+                            settings.GOOGLE_SHEETS_SPREADSHEET_ID,
+                            search_query=query,
+                            source='Google Maps'
+                        )
+                        messages.success(
+                            request,
+                            f'Auto-saved {saved_count} café(s) with Instagram! Exporting to Google Sheets in the background.'
+                        )
                     elif saved_count > 0:
                         messages.success(request, f'Auto-saved {saved_count} café(s) with Instagram!')
                     elif len(results) > 0:
@@ -226,27 +264,59 @@ def google_search_view(request):
                 
                 except Exception as e:
                     error = str(e)
-                    print(f"DEBUG: Search error: {error}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Google search for %r failed", query)
                     messages.error(request, f'Search failed: {error}')
             else:
-                print(f"DEBUG: Form validation failed: {form.errors}")
+                logger.debug("Google search form invalid: %s", form.errors)
                 messages.error(request, 'Please enter a valid search query.')
     
-    # If we have results in session, display them
-    if not results and 'google_search_results' in request.session:
-        results = request.session['google_search_results']
+    # If we have cached results from an earlier search, display them
+    if not results:
+        results = _load_search_results(request, 'google_search_results')
     
     context = {
         'form': form,
         'results': results,
         'error': error,
+        'sheets_export_id': request.session.pop('sheets_export_id', None),
     }
     
     return render(request, 'leads/google_search.html', context)
 
 
+def _store_search_results(request, session_key, results):
+    """
+    Keeps search results for redisplay when the page is reloaded.
+    
+    With a shared cache (REDIS_URL) they are cached for
+    SEARCH_RESULTS_CACHE_TIMEOUT seconds and the session only keeps their id,
+    so large result lists are not serialized into every session write. The
+    per-process default cache can't be read by other workers, so without one
+    the results are stored in the session itself.
+    """
+    id_key = f'{session_key}_id'
+    request.session.pop(id_key, None)
+    request.session.pop(session_key, None)
+    
+    if is_shared_cache():
+        results_id = uuid.uuid4().hex
+        cache.set(f'search_results:{results_id}', results, SEARCH_RESULTS_CACHE_TIMEOUT)
+        request.session[id_key] = results_id
+    else:
+        request.session[session_key] = results
+
+
+def _load_search_results(request, session_key):
+    """
+    Returns the results stored by _store_search_results(), or None if there
+    are none or they have expired.
+    """
+    results_id = request.session.get(f'{session_key}_id')
+    if results_id:
+        return cache.get(f'search_results:{results_id}')
+    return request.session.get(session_key)
+
+
 # ============================================================================
 # Apify Search Views
 # ============================================================================
@@ -254,8 +324,11 @@ def google_search_view(request):
 @login_required
 def apify_search_view(request):
     """
-    Apify search page for TikTok/Instagram - handles search and displays results.
+    Apify search page for TikTok/Instagram - starts searches and displays results.
     Supports profile, hashtag, and place searches.
+    
+    Searches run in the background (see leads.tasks); the page polls
+    search_status_view while the latest search is running.
     """
     form = ApifySearchForm()
     results = None
@@ -277,135 +350,91 @@ def apify_search_view(request):
                     status='running',
                     created_by=request.user,
                 )
+                submit_apify_search(search_query, query, platform, search_type)
                 
-                try:
-                    # Run Apify actor with search type
-                    results = run_apify_actor(query, platform, search_type)
-                    
-                    # Store results in session for display
-                    request.session['apify_search_results'] = results
-                    request.session['apify_search_query'] = query
-                    request.session['apify_search_platform'] = platform
-                    request.session['apify_search_type'] = search_type
-                    request.session['apify_search_query_id'] = search_query.id
-                    
-                    # Update search query status to 'done'
-                    search_query.status = 'done'
-                    search_query.save()
-                    
-                    messages.success(request, f'Found {len(results)} results for "{query}" on {platform} ({search_type})')
-                    
-                    # AUTO-SAVE all results with Instagram immediately
-                    source_mapping = {
-                        'tiktok': 'apify_tiktok',
-                        'instagram': 'apify_instagram',
-                    }
-                    source = source_mapping.get(platform, 'manual')
-                    
-                    saved_cafes = []
-                    saved_count = 0
-                    
-                    for result in results:
-                        username = result.get('username', '')
-                        
-                        if not username:
-                            continue
-                        
-                        # For TikTok, only save if Instagram handle was extracted from bio
-                        # For Instagram, save all results
-                        if platform == 'tiktok' and not result.get('instagram_handle'):
-                            continue
-                        
-                        # Check if café already exists by handle
-                        field_name = f'{platform}_handle'
-                        filter_kwargs = {field_name: username}
-                        existing = Cafe.objects.filter(**filter_kwargs).first()
-                        
-                        if existing:
-                            continue
-                        
-                        # Create new café entry
-                        cafe_data = {
-                            'name': result.get('name', username),
-                            'source': source,
-                        }
-                        
-                        # Add location if available (from place search)
-                        if result.get('location'):
-                            cafe_data['city'] = result.get('location', '')
-                        
-                        if platform == 'tiktok':
-                            cafe_data['tiktok_handle'] = username
-                            # If Instagram handle was extracted from TikTok bio, save it too
-                            if result.get('instagram_handle'):
-                                cafe_data['instagram_handle'] = result.get('instagram_handle')
-                        elif platform == 'instagram':
-                            cafe_data['instagram_handle'] = username
-                        
-                        cafe = Cafe.objects.create(**cafe_data)
-                        saved_count += 1
-                        
-                        # Add to list for bulk export
-                        saved_cafes.append({
-                            'name': cafe.name,
-                            'city': cafe.city or '',
-                            'address': cafe.address or '',
-                            'website': cafe.website or '',
-                            'instagram_handle': cafe.instagram_handle or '',
-                            'tiktok_handle': cafe.tiktok_handle or '',
-                            'source': cafe.source,
-                            'created_at': cafe.created_at,
-                            'notes': cafe.notes or ''
-                        })
-                    
-                    # Export to NEW TAB in Google Sheets
-                    if saved_cafes and settings.GOOGLE_SHEETS_SPREADSHEET_ID:
-                        try:
-                            platform_name = platform.title()
-                            print(f"DEBUG APIFY: Auto-saving {len(saved_cafes)} accounts to Google Sheets")
-                            export_result = export_to_new_tab(
-                                saved_cafes,
-                                settings.GOOGLE_SHEETS_SPREADSHEET_ID,
-                                search_query=query,
-                                source=platform_name
-                            )
-                            messages.success(
-                                request,
-                                f'Auto-saved {saved_count} account(s) with Instagram! '
-                                f'Exported to: <strong>{export_result["tab_name"]}</strong>. '
-                                f'<a href="{export_result["spreadsheet_url"]}" target="_blank" class="alert-link">Open Sheet</a>',
-                                extra_tags='safe'
-                            )
-                        except Exception as e:
-                            print(f"DEBUG APIFY: Export failed: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                            if saved_count > 0:
-                                messages.warning(request, f'Saved {saved_count} accounts but export failed: {str(e)}')
-                    elif saved_count > 0:
-                        messages.success(request, f'Auto-saved {saved_count} account(s) with Instagram!')
-                    elif platform == 'tiktok':
-                        messages.info(request, f'Found {len(results)} TikTok accounts but none had Instagram in bio.')
-                
-                except Exception as e:
-                    error = str(e)
-                    search_query.status = 'failed'
-                    search_query.save()
-                    messages.error(request, f'Search failed: {error}')
+                request.session['apify_search_query_id'] = search_query.id
+                return redirect('apify_search')
     
-    # If we have results in session, display them
-    if not results and 'apify_search_results' in request.session:
-        results = request.session['apify_search_results']
+    # Sessions from before results moved to SearchQuery.results_json may still
+    # carry the full payload; drop it so it isn't re-saved on every request
+    for key in LEGACY_APIFY_SESSION_KEYS:
+        request.session.pop(key, None)
+    
+    # Show the latest search started from this session
+    search_query = None
+    search_query_id = request.session.get('apify_search_query_id')
+    if search_query_id:
+        search_query = SearchQuery.objects.filter(pk=search_query_id, created_by=request.user).first()
+    if search_query:
+        expire_stale_search(search_query)
+    
+    if search_query and search_query.status == 'done':
+        results = search_query.results_json or []
+        
+        # Report the outcome once, on the first page load after it finished
+        if request.session.get('apify_search_reported_id') != search_query.id:
+            request.session['apify_search_reported_id'] = search_query.id
+            messages.success(request, f'Found {len(results)} results for "{search_query.query_text}" on {search_query.platform}')
+            if search_query.saved_count and search_query.export_status:
+                messages.success(
+                    request,
+                    f'Auto-saved {search_query.saved_count} account(s) with Instagram! Exporting to Google Sheets in the background.'
+                )
+            elif search_query.saved_count:
+                messages.success(request, f'Auto-saved {search_query.saved_count} account(s) with Instagram!')
+            elif search_query.platform == 'tiktok':
+                messages.info(request, f'Found {len(results)} TikTok accounts but none had Instagram in bio.')
+        
+        # Report the Sheets export once it has settled (it runs after the search)
+        if (search_query.export_status in ('done', 'failed')
+                and request.session.get('apify_export_reported_id') != search_query.id):
+            request.session['apify_export_reported_id'] = search_query.id
+            if search_query.export_status == 'done':
+                messages.success(request, f'Exported {search_query.saved_count} account(s) to a new Google Sheets tab.')
+            else:
+                messages.warning(request, f'Google Sheets export failed: {search_query.export_error}')
+    elif search_query and search_query.status == 'failed':
+        error = search_query.error_message
+        if request.session.get('apify_search_reported_id') != search_query.id:
+            request.session['apify_search_reported_id'] = search_query.id
+            messages.error(request, f'Search failed: {error}')
     
     context = {
         'form': form,
         'results': results,
         'error': error,
+        'running_search': search_query if search_query and 'running' in (search_query.status, search_query.export_status) else None,
+        'sheets_export_id': request.session.pop('sheets_export_id', None),
     }
     
     return render(request, 'leads/apify_search.html', context)
 
 
+@login_required
+def search_status_view(request, pk):
+    """
+    JSON status of a background Apify search, polled by the search page.
+    """
+    search_query = get_object_or_404(
+        SearchQuery.objects.only('status', 'export_status', 'created_at'), pk=pk, created_by=request.user
+    )
+    expire_stale_search(search_query)
+    return JsonResponse({'status': search_query.status, 'export_status': search_query.export_status})
+
+
+@login_required
+def export_status_view(request, export_id):
+    """
+    JSON status of a background Google Sheets export started by a search view.
+    """
+    status = get_export_status(export_id)
+    
+    if status is None:
+        raise Http404('Unknown export')
+    
+    return JsonResponse(status)
+
+
 # ============================================================================
 # Café List and Detail Views
 # ============================================================================
@@ -415,20 +444,7 @@ def cafe_list_view(request):
     """
     Paginated list of all cafés with filtering and export functionality.
     """
-    # Get all cafés
-    cafes = Cafe.objects.all()
-    
-    # Handle filters
-    filter_form = CafeFilterForm(request.GET)
-    if filter_form.is_valid():
-        source = filter_form.cleaned_data.get('source')
-        city = filter_form.cleaned_data.get('city')
-        
-        if source:
-            cafes = cafes.filter(source=source)
-        
-        if city:
-            cafes = cafes.filter(city__icontains=city)
+    cafes, filter_form = _filter_cafes(request)
     
     # Handle export to Google Sheets
     if request.method == 'POST' and 'export_to_sheets' in request.POST:
@@ -444,20 +460,9 @@ def cafe_list_view(request):
                 )
                 return redirect('cafe_list')
             
-            # Prepare café data for export
-            cafes_data = []
-            for cafe in cafes:
-                cafes_data.append({
-                    'name': cafe.name,
-                    'city': cafe.city or '',
-                    'address': cafe.address or '',
-                    'website': cafe.website or '',
-                    'instagram_handle': cafe.instagram_handle or '',
-                    'tiktok_handle': cafe.tiktok_handle or '',
-                    'source': cafe.source,
-                    'created_at': cafe.created_at,
-                    'notes': cafe.notes or ''
-                })
+            # Stream café data for export as plain dicts straight from the DB
+            # cursor; the exporter consumes it one Sheets chunk at a time
+            cafes_data = cafes.values(*CAFE_EXPORT_FIELDS).iterator(chunk_size=EXPORT_DB_CHUNK_SIZE)
             
             # Export to predefined Google Sheet
             result = export_cafes_to_sheet(
@@ -486,15 +491,32 @@ def cafe_list_view(request):
         
         return redirect('cafe_list')
     
-    # Pagination
-    paginator = Paginator(cafes, 20)  # Show 20 cafés per page
+    # Pagination; the table only needs a few columns, the export above needs all
+    paginator = Paginator(cafes.only(*CAFE_LIST_FIELDS), CAFE_LIST_PAGE_SIZE)
+    
+    # Filtered total (and, with a shared cache, page rows) are cached per filter
+    # combination until a café is written (the version changes). The total is
+    # handed to the paginator (Paginator.count is a cached_property) so the
+    # page runs no COUNT of its own; the template's total reads the same value.
+    shared_cache = is_shared_cache()
+    cache_prefix = f'{get_version(CAFE_CACHE_NAMESPACE)}:{cafes.query}'
+    count_key = make_key('cafes:count', cache_prefix)
+    count_timeout = CAFE_SHARED_CACHE_TIMEOUT if shared_cache else CAFE_COUNT_CACHE_TIMEOUT
+    paginator.count = cache.get_or_set(count_key, cafes.count, count_timeout)
+    
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
+    if shared_cache:
+        page_key = make_key('cafes:page', f'{cache_prefix}:{page_obj.number}')
+        page_obj.object_list = cache.get_or_set(
+            page_key, lambda: list(page_obj.object_list), CAFE_SHARED_CACHE_TIMEOUT
+        )
+    
     context = {
         'page_obj': page_obj,
         'filter_form': filter_form,
-        'total_cafes': cafes.count(),
+        'total_cafes': paginator.count,
         'spreadsheet_url': request.session.get('spreadsheet_url'),
         'spreadsheet_id': settings.GOOGLE_SHEETS_SPREADSHEET_ID,
     }
@@ -502,6 +524,63 @@ def cafe_list_view(request):
     return render(request, 'leads/cafe_list.html', context)
 
 
+@login_required
+def cafe_export_csv_view(request):
+    """
+    Downloads the café list (with the list's filters) as CSV.
+    
+    Rows are streamed from a DB iterator as they are written, in the same
+    columns as the Google Sheets export, so large lists start downloading
+    at once and never sit in memory.
+    """
+    cafes, _ = _filter_cafes(request)
+    
+    cafes_data = cafes.values(*CAFE_EXPORT_FIELDS).iterator(chunk_size=EXPORT_DB_CHUNK_SIZE)
+    rows = itertools.chain([HEADERS], iter_cafe_rows(cafes_data))
+    writer = csv.writer(_Echo())
+    
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows),
+        content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'attachment; filename="cafes.csv"'
+    return response
+
+
+def _filter_cafes(request):
+    """
+    Applies the café list filters from the query string.
+    
+    Returns:
+        Tuple of (filtered Cafe queryset, bound CafeFilterForm)
+    """
+    # Get all cafés
+    cafes = Cafe.objects.all()
+    
+    # Handle filters
+    filter_form = CafeFilterForm(request.GET)
+    if filter_form.is_valid():
+        source = filter_form.cleaned_data.get('source')
+        city = filter_form.cleaned_data.get('city')
+        
+        if source:
+            cafes = cafes.filter(source=source)
+        
+        if city:
+            cafes = cafes.filter(city__icontains=city)
+    
+    return cafes, filter_form
+
+
+class _Echo:
+    """
+    File-like object for csv.writer whose write() returns the line instead
+    of storing it, so each row can be yielded to a streaming response.
+    """
+    def write(self, value):
+        return value
+
+
 class CafeDetailView(LoginRequiredMixin, DetailView):
     """
     Detailed view of a single café.
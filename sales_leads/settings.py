@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.forms',  # Widget templates for FORM_RENDERER below
     'leads',  # Our sales leads app
 ]
 
@@ -61,7 +62,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -69,10 +69,20 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept in memory (replaces APP_DIRS)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
+# Render form widgets through the TEMPLATES engine so they share the cached loader
+FORM_RENDERER = 'django.forms.renderers.TemplatesSetting'
+
 WSGI_APPLICATION = 'sales_leads.wsgi.application'
 
 
@@ -99,6 +109,65 @@ DATABASES = {
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Defaults to per-process local memory. Set REDIS_URL to share cached
+# Google Places / website lookups between workers (requires the redis package).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+# App loggers emit debug output only when DEBUG is on; production keeps WARNING
+# and above so debug messages are never formatted. Set LEADS_LOG_FILE to also
+# write them to a size-rotated log file.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {levelname} {name}: {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'leads': {
+            'handlers': ['console'],
+            'level': os.getenv('LEADS_LOG_LEVEL', 'DEBUG' if DEBUG else 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+if os.getenv('LEADS_LOG_FILE'):
+    LOGGING['handlers']['file'] = {
+        'class': 'logging.handlers.RotatingFileHandler',
+        'filename': os.getenv('LEADS_LOG_FILE'),
+        'maxBytes': 10 * 1024 * 1024,
+        'backupCount': 5,
+        'formatter': 'simple',
+    }
+    LOGGING['loggers']['leads']['handlers'].append('file')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -147,6 +216,9 @@ LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
 
+# Rows per INSERT when saving search results (Cafe.bulk_upsert)
+CAFE_BULK_CREATE_BATCH_SIZE = int(os.getenv('CAFE_BULK_CREATE_BATCH_SIZE', '500'))
+
 # External API Keys (from environment variables)
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY', '')
 APIFY_TOKEN = os.getenv('APIFY_TOKEN', '')
@@ -158,3 +230,4 @@ GOOGLE_SHEETS_CREDENTIALS_PATH = os.path.join(BASE_DIR, 'credentials', 'google_s
 GOOGLE_SHEETS_SPREADSHEET_ID = os.getenv('GOOGLE_SHEETS_SPREADSHEET_ID', '')
 GOOGLE_SHEETS_AUTO_EXPORT = os.getenv('GOOGLE_SHEETS_AUTO_EXPORT', 'True') == 'True'
 GOOGLE_SHEETS_SHEET_NAME = os.getenv('GOOGLE_SHEETS_SHEET_NAME', 'Sheet1')  # Name of the tab/sheet
+GOOGLE_SHEETS_GZIP_REQUESTS = os.getenv('GOOGLE_SHEETS_GZIP_REQUESTS', 'False') == 'True'  # Gzip large API request bodies
@@ -10,13 +10,38 @@ Usage:
 import os
 import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def test_apify_actor(actor_id, platform_name):
-    """Test if an Apify actor is accessible and valid."""
+APIFY_ACTS_URL = "https://api.apify.com/v2/acts"
+
+
+def start_probes(session, executor, actor_ids):
+    """
+    Starts the actor and input-schema GETs for every actor at once.
+    
+    Returns a dict mapping each URL to a future of its response, so
+    test_apify_actor() only waits for the slowest probe instead of
+    running them one after another.
+    """
+    probes = {}
+    for actor_id in actor_ids:
+        if not actor_id:
+            continue
+        # The actor body is only read (by .json()) when the status is OK, so
+        # a 401/403/404 costs just the response headers
+        actor_url = f"{APIFY_ACTS_URL}/{actor_id}"
+        probes[actor_url] = executor.submit(session.get, actor_url, timeout=10, stream=True)
+        schema_url = f"{APIFY_ACTS_URL}/{actor_id}/input-schema"
+        probes[schema_url] = executor.submit(session.get, schema_url, timeout=10)
+    return probes
+
+
+def test_apify_actor(actor_id, platform_name, probes):
+    """Test if an Apify actor is accessible and valid (probes: see start_probes)."""
     print(f"\n{'='*60}")
     print(f"Testing {platform_name} Actor: {actor_id}")
     print('='*60)
@@ -33,11 +58,10 @@ def test_apify_actor(actor_id, platform_name):
     
     # Test 1: Check if actor exists
     print("\n1. Checking if actor exists...")
-    url = f"https://api.apify.com/v2/acts/{actor_id}"
-    headers = {'Authorization': f'Bearer {api_token}'}
+    url = f"{APIFY_ACTS_URL}/{actor_id}"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = probes[url].result()
         
         if response.status_code == 404:
             print(f"❌ Actor not found!")
@@ -67,10 +91,10 @@ def test_apify_actor(actor_id, platform_name):
     
     # Test 2: Check actor input schema
     print("\n2. Checking actor input schema...")
-    input_url = f"https://api.apify.com/v2/acts/{actor_id}/input-schema"
+    input_url = f"{APIFY_ACTS_URL}/{actor_id}/input-schema"
     
     try:
-        response = requests.get(input_url, headers=headers, timeout=10)
+        response = probes[input_url].result()
         if response.status_code == 200:
             schema = response.json()
             print(f"✅ Input schema available")
@@ -99,7 +123,7 @@ def test_apify_actor(actor_id, platform_name):
     #     'search': 'test',
     #     'maxResults': 1,
     # }
-    # run_url = f"https://api.apify.com/v2/acts/{actor_id}/runs"
+    # run_url = f"{APIFY_ACTS_URL}/{actor_id}/runs"
     # try:
     #     response = requests.post(run_url, json=test_payload, headers={
     #         'Content-Type': 'application/json',
@@ -128,13 +152,22 @@ def main():
         print("   Create a .env file based on env.example")
         return
     
-    # Test TikTok actor
+    api_token = os.getenv('APIFY_TOKEN')
     tiktok_actor = os.getenv('APIFY_ACTOR_TIKTOK')
-    tiktok_ok = test_apify_actor(tiktok_actor, 'TikTok')
-    
-    # Test Instagram actor
     instagram_actor = os.getenv('APIFY_ACTOR_INSTAGRAM')
-    instagram_ok = test_apify_actor(instagram_actor, 'Instagram')
+    
+    # One keep-alive session for all probes, which run concurrently
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=4) as executor:
+        probes = {}
+        if api_token:
+            session.headers.update({'Authorization': f'Bearer {api_token}'})
+            probes = start_probes(session, executor, [tiktok_actor, instagram_actor])
+        
+        # Test TikTok actor
+        tiktok_ok = test_apify_actor(tiktok_actor, 'TikTok', probes)
+        
+        # Test Instagram actor
+        instagram_ok = test_apify_actor(instagram_actor, 'Instagram', probes)
     
     # Summary
     print("\n" + "="*60)